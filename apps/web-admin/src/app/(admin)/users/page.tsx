@@ -1,6 +1,6 @@
 "use client"
 
-import { useState, useMemo } from "react"
+import { useState, useMemo, useRef } from "react"
 import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query"
 import { userApi } from "@/services/user-api"
 import { UserFilters } from "@/components/users/user-filters"
@@ -16,7 +16,9 @@ const PAGE_SIZE = 20
 
 export default function UsersPage() {
   const queryClient = useQueryClient()
-  const [page, setPage] = useState(1)
+  // cursors[i] is the keyset cursor that loads page i + 1 (first page has none)
+  const [cursors, setCursors] = useState<(string | undefined)[]>([undefined])
+  const page = cursors.length
   const [search, setSearch] = useState("")
   const [statusFilter, setStatusFilter] = useState("all")
 
@@ -26,10 +28,10 @@ export default function UsersPage() {
   const [deleteUser, setDeleteUser] = useState<UserAccount | null>(null)
 
   const { data, isLoading } = useQuery({
-    queryKey: ["users", page, search, statusFilter],
+    queryKey: ["users", cursors[page - 1], search, statusFilter],
     queryFn: () =>
       userApi.list({
-        page,
+        cursor: cursors[page - 1],
         size: PAGE_SIZE,
         search: search || undefined,
         is_active:
@@ -38,14 +40,29 @@ export default function UsersPage() {
             : statusFilter === "inactive"
             ? false
             : undefined,
+        // Only the first page pays for the COUNT query
+        include_total: page === 1,
       }),
   })
 
+  const totalRef = useRef(0)
+  if (data?.total != null) totalRef.current = data.total
+
   const filteredUsers = useMemo(() => {
     return data?.items || []
   }, [data?.items])
 
-  const totalPages = data?.pages || 1
+  const totalPages = data?.has_next ? page + 1 : page
+
+  const handlePageChange = (next: number) => {
+    if (next > page && data?.next_cursor) {
+      setCursors([...cursors, data.next_cursor])
+    } else if (next < page) {
+      setCursors(cursors.slice(0, next))
+    }
+  }
+
+  const resetPages = () => setCursors([undefined])
 
   const createMutation = useMutation({
     mutationFn: (req: CreateUserRequest) => userApi.create(req),
@@ -85,7 +102,7 @@ export default function UsersPage() {
         <div>
           <h1 className="text-2xl font-bold">Users</h1>
           <p className="text-muted-foreground">
-            Manage user accounts ({data?.total || 0} total)
+            Manage user accounts ({totalRef.current} total)
           </p>
         </div>
         <Button onClick={() => setCreateOpen(true)}>
@@ -98,12 +115,12 @@ export default function UsersPage() {
         search={search}
         onSearchChange={(v) => {
           setSearch(v)
-          setPage(1)
+          resetPages()
         }}
         statusFilter={statusFilter}
         onStatusFilterChange={(v) => {
           setStatusFilter(v)
-          setPage(1)
+          resetPages()
         }}
       />
 
@@ -112,7 +129,7 @@ export default function UsersPage() {
         isLoading={isLoading}
         page={page}
         totalPages={totalPages}
-        onPageChange={setPage}
+        onPageChange={handlePageChange}
         onEdit={setEditUser}
         onToggleActive={(user) => toggleMutation.mutate(user.id)}
         onDelete={setDeleteUser}
@@ -7,10 +7,11 @@ import type {
 } from "@/types/user"
 
 export interface UserListParams {
-  page?: number
+  cursor?: string
   size?: number
   search?: string
   is_active?: boolean
+  include_total?: boolean
 }
 
 export const userApi = {
@@ -30,8 +30,9 @@ export interface UpdateUserRequest {
 
 export interface UserListResponse {
   items: UserAccount[]
-  total: number
-  page: number
+  total: number | null
   size: number
-  pages: number
+  pages: number | null
+  next_cursor: string | null
+  has_next: boolean
 }
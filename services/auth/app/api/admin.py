@@ -1,11 +1,25 @@
 """Admin API endpoints for user, role, and permission management."""
 
+import logging
+import time
+from collections.abc import Collection
+from typing import Any
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import ORJSONResponse
+from redis.exceptions import RedisError
+from sqlalchemy import Row, func, select, tuple_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_active_superuser
+from app.api.deps import (
+    TokenClaims,
+    forget_auth_user,
+    get_audit,
+    get_current_active_superuser,
+    get_rbac,
+)
 from app.core.database import get_db
 from app.models.user import User
 from app.schemas.admin import (
@@ -14,89 +28,204 @@ from app.schemas.admin import (
     PermissionResponse,
     RoleCreate,
     RolePermissionAssign,
+    RolePermissionsAssign,
     RoleResponse,
     RoleWithPermissions,
     UserListResponse,
     UserResponse,
     UserRoleAssign,
+    UserRolesAssign,
     UserUpdate,
 )
+from app.schemas.user import UserUpdate as BaseUserUpdate
 from app.services.audit_service import AuditAction, AuditService, ResourceType
+from app.services.permission_cache import permission_cache
 from app.services.rbac_service import RBACService
-from app.services.user_service import UserService
+from app.services.token_revocation import revoke_user_tokens
+from app.services.user_service import ADMIN_USER_COLUMNS, UserService
+from app.utils.pagination import decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Prebuilt errors for the role and permission endpoints (see app.api.deps)
+_ROLE_EXISTS = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Role with this name already exists",
+)
+_ROLE_NOT_FOUND = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND,
+    detail="Role not found",
+)
+_PERMISSION_EXISTS = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Permission with this code already exists",
+)
+_PERMISSIONS_NOT_FOUND = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND,
+    detail="One or more permissions not found",
+)
+_ROLE_PERMISSION_NOT_FOUND = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND,
+    detail="Role-permission assignment not found",
+)
+_USER_OR_ROLES_NOT_FOUND = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND,
+    detail="User or one or more roles not found",
+)
+_USER_ROLE_NOT_FOUND = HTTPException(
+    status_code=status.HTTP_404_NOT_FOUND,
+    detail="User-role assignment not found",
+)
+_REVOCATION_UNAVAILABLE = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Token revocation temporarily unavailable",
+    headers={"Retry-After": "1"},
+)
+_PERMISSION_CACHE_UNAVAILABLE = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Permission cache temporarily unavailable",
+    headers={"Retry-After": "1"},
+)
+
+# Permissions are global and only change through create_permission, so the
+# full list is cached per process: (monotonic timestamp, rows).
+PERMISSION_LIST_TTL_SECONDS = 30.0
+_permission_list_cache: tuple[float, list[dict[str, Any]]] | None = None
+
+
+def _invalidate_permission_list() -> None:
+    """Drop the cached permission list after a permission is written."""
+    global _permission_list_cache
+    _permission_list_cache = None
+
+
+async def _revoke_user_tokens(user_id: UUID) -> None:
+    """Revoke a user's access tokens, or fail the request with 503.
+
+    Called before the change is committed, so an unreachable Redis rolls the
+    change back instead of leaving old tokens with their former rights.
+    """
+    try:
+        await revoke_user_tokens(user_id)
+    except RedisError:
+        raise _REVOCATION_UNAVAILABLE.with_traceback(None) from None
+
+
+async def _commit_invalidating_permissions(db: AsyncSession, user_ids: Collection[UUID]) -> None:
+    """Commit a change to users' grants and invalidate their cached permissions.
+
+    Invalidates before committing, so an unreachable Redis fails the request
+    with 503 and rolls the change back rather than leaving revoked grants
+    cached. Invalidates again once committed, so grants loaded by a request
+    that raced the commit are not cached either.
+    """
+    try:
+        await permission_cache.invalidate(user_ids)
+    except RedisError:
+        raise _PERMISSION_CACHE_UNAVAILABLE.with_traceback(None) from None
+    await db.commit()
+    try:
+        await permission_cache.invalidate(user_ids)
+    except RedisError:
+        logger.error("Permission cache not invalidated after commit: Redis unavailable")
 
 
-def get_client_ip(request: Request) -> str:
-    """Extract client IP from request."""
-    forwarded = request.headers.get("X-Forwarded-For")
-    if forwarded:
-        return forwarded.split(",")[0].strip()
-    return request.client.host if request.client else "unknown"
+def _user_response(user: User | Row) -> UserResponse:
+    """Build an admin UserResponse from a User or an ``ADMIN_USER_COLUMNS`` user."""
+    return UserResponse(
+        id=user.id,
+        email=user.email or "",
+        first_name=user.first_name,
+        last_name=user.last_name,
+        phone_number=user.phone_number,
+        is_active=user.is_active,
+        is_superuser=user.is_superuser,
+        totp_enabled=user.totp_enabled,
+        created_at=user.created_at,
+        last_login=user.last_login,
+    )
 
 
-router = APIRouter()
+def _user_item(row: Row) -> dict[str, Any]:
+    """An ``ADMIN_USER_COLUMNS`` row as a UserResponse-shaped dict."""
+    item = {column.key: row._mapping[column.key] for column in ADMIN_USER_COLUMNS}
+    # Phone-only accounts have no email
+    item["email"] = item["email"] or ""
+    return item
 
 
 # User Management Endpoints
-@router.get("/users", response_model=UserListResponse)
+@router.get("/users", responses={200: {"model": UserListResponse}})
 async def list_users(
-    page: int = Query(1, ge=1),
+    cursor: str | None = Query(None),
     size: int = Query(20, ge=1, le=100),
     search: str | None = Query(None),
     is_active: bool | None = Query(None),
+    include_total: bool = Query(False),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser),
-) -> UserListResponse:
-    """List all users with pagination and optional filters."""
-    from sqlalchemy import select as sa_select
-    from sqlalchemy.orm import selectinload as si_load
+    current_user: TokenClaims = Depends(get_current_active_superuser),
+) -> ORJSONResponse:
+    """List all users with keyset pagination and optional filters.
 
-    from app.models.user import User as UserModel
-
-    query = sa_select(UserModel).options(si_load(UserModel.roles))
+    The total count is only computed when ``include_total`` is set, in the
+    same statement as the page; clients otherwise navigate with
+    ``next_cursor``/``has_next``.
+    """
+    # Plain column projection: rows come back as tuples, no ORM hydration
+    query = select(*ADMIN_USER_COLUMNS)
 
     if search:
         search_filter = f"%{search}%"
         query = query.where(
-            UserModel.first_name.ilike(search_filter)
-            | UserModel.last_name.ilike(search_filter)
-            | UserModel.email.ilike(search_filter)
+            User.first_name.ilike(search_filter)
+            | User.last_name.ilike(search_filter)
+            | User.email.ilike(search_filter)
         )
 
     if is_active is not None:
-        query = query.where(UserModel.is_active == is_active)
-
-    from sqlalchemy import func
-
-    count_q = sa_select(func.count()).select_from(query.subquery())
-    total = (await db.execute(count_q)).scalar() or 0
-
-    query = query.order_by(UserModel.created_at.desc())
-    query = query.offset((page - 1) * size).limit(size)
-    rows = (await db.execute(query)).scalars().all()
-
-    items = [
-        UserResponse(
-            id=u.id,
-            email=u.email or "",
-            first_name=u.first_name,
-            last_name=u.last_name,
-            phone_number=u.phone_number,
-            is_active=u.is_active,
-            is_superuser=u.is_superuser,
-            totp_enabled=u.totp_enabled,
-            created_at=u.created_at,
-            last_login=u.last_login,
-        )
-        for u in rows
-    ]
-
-    return UserListResponse(
-        items=items,
-        total=total,
-        page=page,
-        size=size,
-        pages=(total + size - 1) // size if total else 1,
+        query = query.where(User.is_active == is_active)
+
+    # Counts every match, not just the rows past the cursor; uncorrelated,
+    # so the database evaluates it once per statement
+    count_q = select(func.count()).select_from(query.subquery())
+    if include_total:
+        query = query.add_columns(count_q.scalar_subquery().label("total"))
+
+    if cursor:
+        try:
+            cursor_ts, cursor_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        query = query.where(tuple_(User.created_at, User.id) < tuple_(cursor_ts, cursor_id))
+
+    query = query.order_by(User.created_at.desc(), User.id.desc()).limit(size + 1)
+    rows = (await db.execute(query)).all()
+
+    has_next = len(rows) > size
+    rows = rows[:size]
+
+    total: int | None = None
+    if include_total:
+        if rows:
+            total = rows[0].total
+        elif cursor:
+            # Past the last page the count has no row to ride on
+            total = (await db.execute(count_q)).scalar() or 0
+        else:
+            total = 0
+
+    # Rows already have the UserResponse shape; orjson serializes them directly
+    return ORJSONResponse(
+        content={
+            "items": [_user_item(row) for row in rows],
+            "total": total,
+            "size": size,
+            "pages": ((total + size - 1) // size or 1) if total is not None else None,
+            "next_cursor": encode_cursor(rows[-1].created_at, rows[-1].id) if has_next else None,
+            "has_next": has_next,
+        }
     )
 
 
@@ -105,11 +234,11 @@ async def create_user(
     data: AdminUserCreate,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser),
+    audit: AuditService = Depends(get_audit),
+    current_user: TokenClaims = Depends(get_current_active_superuser),
 ) -> UserResponse:
     """Create a new user account."""
     user_svc = UserService(db)
-    audit = AuditService(db)
 
     try:
         user = await user_svc.create_user(
@@ -120,33 +249,22 @@ async def create_user(
             phone_number=data.phone_number,
             is_superuser=data.is_superuser,
         )
-        await db.commit()
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    await audit.log(
+    await db.commit()
+
+    await audit.log_async(
         action=AuditAction.USER_CREATE,
         resource_type=ResourceType.USER,
         resource_id=str(user.id),
-        user_id=current_user.id,
+        user_id=current_user.user_id,
         details={"email": user.email},
-        ip_address=get_client_ip(request),
-        user_agent=request.headers.get("User-Agent"),
+        ip_address=request.state.client_ip,
+        user_agent=request.state.user_agent,
     )
-    await db.commit()
 
-    return UserResponse(
-        id=user.id,
-        email=user.email or "",
-        first_name=user.first_name,
-        last_name=user.last_name,
-        phone_number=user.phone_number,
-        is_active=user.is_active,
-        is_superuser=user.is_superuser,
-        totp_enabled=user.totp_enabled,
-        created_at=user.created_at,
-        last_login=user.last_login,
-    )
+    return _user_response(user)
 
 
 @router.patch("/users/{user_id}", response_model=UserResponse)
@@ -155,49 +273,44 @@ async def update_user(
     data: UserUpdate,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser),
+    audit: AuditService = Depends(get_audit),
+    current_user: TokenClaims = Depends(get_current_active_superuser),
 ) -> UserResponse:
     """Update a user account."""
     user_svc = UserService(db)
-    audit = AuditService(db)
 
-    try:
-        from app.schemas.user import UserUpdate as BaseUserUpdate
-
-        base_update = BaseUserUpdate(**data.model_dump(exclude_unset=True))
-        user = await user_svc.update_user(user_id, base_update)
-
-        # Handle is_superuser separately (not in base UserUpdate)
-        if data.is_superuser is not None:
-            user.is_superuser = data.is_superuser
+    values = BaseUserUpdate(**data.model_dump(exclude_unset=True)).model_dump(exclude_unset=True)
+    # Handle is_superuser separately (not in base UserUpdate)
+    if data.is_superuser is not None:
+        values["is_superuser"] = data.is_superuser
 
-        await db.commit()
+    try:
+        user = await user_svc.update_user_fields(user_id, values)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
-    await audit.log(
+    # Access tokens carry these flags, so outstanding ones must be reissued
+    flags_changed = "is_active" in values or "is_superuser" in values
+    if flags_changed:
+        await _revoke_user_tokens(user_id)
+    if "is_superuser" in values:
+        await _commit_invalidating_permissions(db, [user_id])
+    else:
+        await db.commit()
+    if flags_changed:
+        forget_auth_user(user_id)
+
+    await audit.log_async(
         action=AuditAction.USER_UPDATE,
         resource_type=ResourceType.USER,
         resource_id=str(user_id),
-        user_id=current_user.id,
+        user_id=current_user.user_id,
         details=data.model_dump(exclude_unset=True),
-        ip_address=get_client_ip(request),
-        user_agent=request.headers.get("User-Agent"),
+        ip_address=request.state.client_ip,
+        user_agent=request.state.user_agent,
     )
-    await db.commit()
 
-    return UserResponse(
-        id=user.id,
-        email=user.email or "",
-        first_name=user.first_name,
-        last_name=user.last_name,
-        phone_number=user.phone_number,
-        is_active=user.is_active,
-        is_superuser=user.is_superuser,
-        totp_enabled=user.totp_enabled,
-        created_at=user.created_at,
-        last_login=user.last_login,
-    )
+    return _user_response(user)
 
 
 @router.post("/users/{user_id}/toggle-active", response_model=UserResponse)
@@ -205,51 +318,33 @@ async def toggle_user_active(
     user_id: UUID,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser),
+    audit: AuditService = Depends(get_audit),
+    current_user: TokenClaims = Depends(get_current_active_superuser),
 ) -> UserResponse:
     """Toggle user active status."""
     user_svc = UserService(db)
-    audit = AuditService(db)
 
     try:
-        existing = await user_svc.get_user(user_id)
-        if not existing:
-            raise ValueError("User not found")
-
-        if existing.is_active:
-            user = await user_svc.deactivate_user(user_id)
-            action = AuditAction.USER_DEACTIVATE
-        else:
-            user = await user_svc.activate_user(user_id)
-            action = AuditAction.USER_ACTIVATE
-
-        await db.commit()
+        user = await user_svc.toggle_user_active(user_id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    action = AuditAction.USER_ACTIVATE if user.is_active else AuditAction.USER_DEACTIVATE
 
-    await audit.log(
+    await _revoke_user_tokens(user_id)
+    await db.commit()
+    forget_auth_user(user_id)
+
+    await audit.log_async(
         action=action,
         resource_type=ResourceType.USER,
         resource_id=str(user_id),
-        user_id=current_user.id,
+        user_id=current_user.user_id,
         details={"is_active": user.is_active},
-        ip_address=get_client_ip(request),
-        user_agent=request.headers.get("User-Agent"),
+        ip_address=request.state.client_ip,
+        user_agent=request.state.user_agent,
     )
-    await db.commit()
 
-    return UserResponse(
-        id=user.id,
-        email=user.email or "",
-        first_name=user.first_name,
-        last_name=user.last_name,
-        phone_number=user.phone_number,
-        is_active=user.is_active,
-        is_superuser=user.is_superuser,
-        totp_enabled=user.totp_enabled,
-        created_at=user.created_at,
-        last_login=user.last_login,
-    )
+    return _user_response(user)
 
 
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -257,20 +352,14 @@ async def delete_user(
     user_id: UUID,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser),
+    audit: AuditService = Depends(get_audit),
+    current_user: TokenClaims = Depends(get_current_active_superuser),
 ) -> None:
     """Permanently delete a user account."""
     user_svc = UserService(db)
-    audit = AuditService(db)
 
     try:
-        user = await user_svc.get_user(user_id)
-        if not user:
-            raise ValueError("User not found")
-
-        email = user.email
-        await user_svc.delete_user(user_id)
-        await db.commit()
+        email = await user_svc.delete_user(user_id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
@@ -278,12 +367,14 @@ async def delete_user(
         action=AuditAction.USER_DELETE,
         resource_type=ResourceType.USER,
         resource_id=str(user_id),
-        user_id=current_user.id,
+        user_id=current_user.user_id,
         details={"email": email},
-        ip_address=get_client_ip(request),
-        user_agent=request.headers.get("User-Agent"),
+        ip_address=request.state.client_ip,
+        user_agent=request.state.user_agent,
     )
-    await db.commit()
+    await _revoke_user_tokens(user_id)
+    await _commit_invalidating_permissions(db, [user_id])
+    forget_auth_user(user_id)
 
 
 # Role Management Endpoints
@@ -292,69 +383,60 @@ async def create_role(
     role_data: RoleCreate,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser),
+    rbac: RBACService = Depends(get_rbac),
+    audit: AuditService = Depends(get_audit),
+    current_user: TokenClaims = Depends(get_current_active_superuser),
 ) -> RoleResponse:
     """Create a new role."""
-    rbac = RBACService(db)
-    audit = AuditService(db)
-
-    # Check if role name already exists
-    existing = await rbac.get_role_by_name(role_data.name)
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Role with this name already exists",
+    # roles.name is unique; let the INSERT detect duplicates
+    try:
+        role = await rbac.create_role(
+            name=role_data.name,
+            description=role_data.description,
+            tenant_id=role_data.tenant_id,
         )
+    except IntegrityError:
+        raise _ROLE_EXISTS.with_traceback(None) from None
 
-    role = await rbac.create_role(
-        name=role_data.name,
-        description=role_data.description,
-        tenant_id=role_data.tenant_id,
-    )
     await db.commit()
 
-    await audit.log(
+    await audit.log_async(
         action=AuditAction.ROLE_CREATE,
         resource_type=ResourceType.ROLE,
         resource_id=str(role.id),
-        user_id=current_user.id,
+        user_id=current_user.user_id,
         details={"name": role.name},
-        ip_address=get_client_ip(request),
-        user_agent=request.headers.get("User-Agent"),
+        ip_address=request.state.client_ip,
+        user_agent=request.state.user_agent,
     )
-    await db.commit()
 
     return RoleResponse.model_validate(role)
 
 
-@router.get("/roles", response_model=list[RoleResponse])
+@router.get("/roles", responses={200: {"model": list[RoleResponse]}})
 async def list_roles(
     tenant_id: UUID | None = Query(None),
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser),
-) -> list[RoleResponse]:
+    rbac: RBACService = Depends(get_rbac),
+    current_user: TokenClaims = Depends(get_current_active_superuser),
+) -> ORJSONResponse:
     """List all roles."""
-    rbac = RBACService(db)
+    # Rows already have the RoleResponse shape; orjson serializes them directly
     roles = await rbac.list_roles(tenant_id)
-    return [RoleResponse.model_validate(r) for r in roles]
+    return ORJSONResponse(content=[dict(r) for r in roles])
 
 
 @router.get("/roles/{role_id}", response_model=RoleWithPermissions)
 async def get_role(
     role_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser),
+    rbac: RBACService = Depends(get_rbac),
+    current_user: TokenClaims = Depends(get_current_active_superuser),
 ) -> RoleWithPermissions:
     """Get role with its permissions."""
-    rbac = RBACService(db)
-    role = await rbac.get_role(role_id)
-    if not role:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Role not found",
-        )
+    found = await rbac.get_role_with_permissions(role_id)
+    if not found:
+        raise _ROLE_NOT_FOUND.with_traceback(None)
 
-    permissions = await rbac.get_role_permissions(role_id)
+    role, permissions = found
     return RoleWithPermissions(
         id=role.id,
         name=role.name,
@@ -371,36 +453,32 @@ async def delete_role(
     role_id: UUID,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser),
+    rbac: RBACService = Depends(get_rbac),
+    audit: AuditService = Depends(get_audit),
+    current_user: TokenClaims = Depends(get_current_active_superuser),
 ) -> None:
     """Delete a role."""
-    rbac = RBACService(db)
-    audit = AuditService(db)
-
     role = await rbac.get_role(role_id)
     if not role:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Role not found",
-        )
+        raise _ROLE_NOT_FOUND.with_traceback(None)
 
+    affected_users = await rbac.get_role_user_ids(role_id)
     try:
         await rbac.delete_role(role_id)
-        await db.commit()
-
-        await audit.log(
-            action=AuditAction.ROLE_DELETE,
-            resource_type=ResourceType.ROLE,
-            resource_id=str(role_id),
-            user_id=current_user.id,
-            details={"name": role.name},
-            ip_address=get_client_ip(request),
-            user_agent=request.headers.get("User-Agent"),
-        )
-        await db.commit()
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+    await audit.log(
+        action=AuditAction.ROLE_DELETE,
+        resource_type=ResourceType.ROLE,
+        resource_id=str(role_id),
+        user_id=current_user.user_id,
+        details={"name": role.name},
+        ip_address=request.state.client_ip,
+        user_agent=request.state.user_agent,
+    )
+    await _commit_invalidating_permissions(db, affected_users)
+
 
 # Permission Management Endpoints
 @router.post("/permissions", response_model=PermissionResponse, status_code=status.HTTP_201_CREATED)
@@ -408,52 +486,54 @@ async def create_permission(
     perm_data: PermissionCreate,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser),
+    rbac: RBACService = Depends(get_rbac),
+    audit: AuditService = Depends(get_audit),
+    current_user: TokenClaims = Depends(get_current_active_superuser),
 ) -> PermissionResponse:
     """Create a new permission."""
-    rbac = RBACService(db)
-    audit = AuditService(db)
-
-    # Check if permission code already exists
-    existing = await rbac.get_permission_by_code(perm_data.code)
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Permission with this code already exists",
+    # permissions.code is unique; let the INSERT detect duplicates
+    try:
+        permission = await rbac.create_permission(
+            code=perm_data.code,
+            name=perm_data.name,
+            resource=perm_data.resource,
+            action=perm_data.action,
+            description=perm_data.description,
         )
+    except IntegrityError:
+        raise _PERMISSION_EXISTS.with_traceback(None) from None
 
-    permission = await rbac.create_permission(
-        code=perm_data.code,
-        name=perm_data.name,
-        resource=perm_data.resource,
-        action=perm_data.action,
-        description=perm_data.description,
-    )
     await db.commit()
+    _invalidate_permission_list()
 
-    await audit.log(
+    await audit.log_async(
         action=AuditAction.PERMISSION_CREATE,
         resource_type=ResourceType.PERMISSION,
         resource_id=str(permission.id),
-        user_id=current_user.id,
+        user_id=current_user.user_id,
         details={"code": permission.code},
-        ip_address=get_client_ip(request),
-        user_agent=request.headers.get("User-Agent"),
+        ip_address=request.state.client_ip,
+        user_agent=request.state.user_agent,
     )
-    await db.commit()
 
     return PermissionResponse.model_validate(permission)
 
 
-@router.get("/permissions", response_model=list[PermissionResponse])
+@router.get("/permissions", responses={200: {"model": list[PermissionResponse]}})
 async def list_permissions(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser),
-) -> list[PermissionResponse]:
+    rbac: RBACService = Depends(get_rbac),
+    current_user: TokenClaims = Depends(get_current_active_superuser),
+) -> ORJSONResponse:
     """List all permissions."""
-    rbac = RBACService(db)
-    permissions = await rbac.list_permissions()
-    return [PermissionResponse.model_validate(p) for p in permissions]
+    global _permission_list_cache
+    now = time.monotonic()
+    if _permission_list_cache and now - _permission_list_cache[0] < PERMISSION_LIST_TTL_SECONDS:
+        return ORJSONResponse(content=_permission_list_cache[1])
+
+    # Rows already have the PermissionResponse shape; orjson serializes them directly
+    permissions = [dict(p) for p in await rbac.list_permissions()]
+    _permission_list_cache = (now, permissions)
+    return ORJSONResponse(content=permissions)
 
 
 # Role-Permission Assignment
@@ -463,33 +543,70 @@ async def assign_permission_to_role(
     data: RolePermissionAssign,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser),
+    rbac: RBACService = Depends(get_rbac),
+    audit: AuditService = Depends(get_audit),
+    current_user: TokenClaims = Depends(get_current_active_superuser),
 ) -> dict:
     """Assign a permission to a role."""
-    rbac = RBACService(db)
-    audit = AuditService(db)
-
     role = await rbac.get_role(role_id)
     if not role:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Role not found")
+        raise _ROLE_NOT_FOUND.with_traceback(None)
 
     await rbac.assign_permission_to_role(role_id, data.permission_id)
-    await db.commit()
+    affected_users = await rbac.get_role_user_ids(role_id)
 
-    await audit.log(
+    await _commit_invalidating_permissions(db, affected_users)
+
+    await audit.log_async(
         action=AuditAction.PERMISSION_ASSIGN,
         resource_type=ResourceType.ROLE,
         resource_id=str(role_id),
-        user_id=current_user.id,
+        user_id=current_user.user_id,
         details={"permission_id": str(data.permission_id)},
-        ip_address=get_client_ip(request),
-        user_agent=request.headers.get("User-Agent"),
+        ip_address=request.state.client_ip,
+        user_agent=request.state.user_agent,
     )
-    await db.commit()
 
     return {"message": "Permission assigned to role"}
 
 
+@router.post("/roles/{role_id}/permissions:bulk", status_code=status.HTTP_201_CREATED)
+async def assign_permissions_bulk(
+    role_id: UUID,
+    data: RolePermissionsAssign,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    rbac: RBACService = Depends(get_rbac),
+    audit: AuditService = Depends(get_audit),
+    current_user: TokenClaims = Depends(get_current_active_superuser),
+) -> dict:
+    """Assign several permissions to a role in a single transaction."""
+    role = await rbac.get_role(role_id)
+    if not role:
+        raise _ROLE_NOT_FOUND.with_traceback(None)
+
+    try:
+        assigned = await rbac.assign_permissions_to_role_bulk(role_id, data.permission_ids)
+    except IntegrityError:
+        raise _PERMISSIONS_NOT_FOUND.with_traceback(None) from None
+
+    affected_users = await rbac.get_role_user_ids(role_id)
+
+    await _commit_invalidating_permissions(db, affected_users)
+
+    await audit.log_async(
+        action=AuditAction.PERMISSIONS_BULK_ASSIGN,
+        resource_type=ResourceType.ROLE,
+        resource_id=str(role_id),
+        user_id=current_user.user_id,
+        details={"permission_ids": [str(pid) for pid in data.permission_ids]},
+        ip_address=request.state.client_ip,
+        user_agent=request.state.user_agent,
+    )
+
+    return {"message": "Permissions assigned to role", "assigned": assigned}
+
+
 @router.delete(
     "/roles/{role_id}/permissions/{permission_id}", status_code=status.HTTP_204_NO_CONTENT
 )
@@ -498,29 +615,26 @@ async def revoke_permission_from_role(
     permission_id: UUID,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser),
+    rbac: RBACService = Depends(get_rbac),
+    audit: AuditService = Depends(get_audit),
+    current_user: TokenClaims = Depends(get_current_active_superuser),
 ) -> None:
     """Revoke a permission from a role."""
-    rbac = RBACService(db)
-    audit = AuditService(db)
-
     if not await rbac.revoke_permission_from_role(role_id, permission_id):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Role-permission assignment not found",
-        )
-    await db.commit()
+        raise _ROLE_PERMISSION_NOT_FOUND.with_traceback(None)
+    affected_users = await rbac.get_role_user_ids(role_id)
 
-    await audit.log(
+    await _commit_invalidating_permissions(db, affected_users)
+
+    await audit.log_async(
         action=AuditAction.PERMISSION_REVOKE,
         resource_type=ResourceType.ROLE,
         resource_id=str(role_id),
-        user_id=current_user.id,
+        user_id=current_user.user_id,
         details={"permission_id": str(permission_id)},
-        ip_address=get_client_ip(request),
-        user_agent=request.headers.get("User-Agent"),
+        ip_address=request.state.client_ip,
+        user_agent=request.state.user_agent,
     )
-    await db.commit()
 
 
 # User-Role Assignment
@@ -530,78 +644,105 @@ async def assign_role_to_user(
     data: UserRoleAssign,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser),
+    rbac: RBACService = Depends(get_rbac),
+    audit: AuditService = Depends(get_audit),
+    current_user: TokenClaims = Depends(get_current_active_superuser),
 ) -> dict:
     """Assign a role to a user."""
-    rbac = RBACService(db)
-    audit = AuditService(db)
+    await rbac.assign_role_to_user(user_id, data.role_id, assigned_by=current_user.user_id)
 
-    await rbac.assign_role_to_user(user_id, data.role_id, assigned_by=current_user.id)
-    await db.commit()
+    await _commit_invalidating_permissions(db, [user_id])
 
-    await audit.log(
+    await audit.log_async(
         action=AuditAction.ROLE_ASSIGN,
         resource_type=ResourceType.USER,
         resource_id=str(user_id),
-        user_id=current_user.id,
+        user_id=current_user.user_id,
         details={"role_id": str(data.role_id)},
-        ip_address=get_client_ip(request),
-        user_agent=request.headers.get("User-Agent"),
+        ip_address=request.state.client_ip,
+        user_agent=request.state.user_agent,
     )
-    await db.commit()
 
     return {"message": "Role assigned to user"}
 
 
+@router.post("/users/{user_id}/roles:bulk", status_code=status.HTTP_201_CREATED)
+async def assign_roles_bulk(
+    user_id: UUID,
+    data: UserRolesAssign,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    rbac: RBACService = Depends(get_rbac),
+    audit: AuditService = Depends(get_audit),
+    current_user: TokenClaims = Depends(get_current_active_superuser),
+) -> dict:
+    """Assign several roles to a user in a single transaction."""
+    try:
+        assigned = await rbac.assign_roles_to_user_bulk(
+            user_id, data.role_ids, assigned_by=current_user.user_id
+        )
+    except IntegrityError:
+        raise _USER_OR_ROLES_NOT_FOUND.with_traceback(None) from None
+
+    await _commit_invalidating_permissions(db, [user_id])
+
+    await audit.log_async(
+        action=AuditAction.ROLES_BULK_ASSIGN,
+        resource_type=ResourceType.USER,
+        resource_id=str(user_id),
+        user_id=current_user.user_id,
+        details={"role_ids": [str(rid) for rid in data.role_ids]},
+        ip_address=request.state.client_ip,
+        user_agent=request.state.user_agent,
+    )
+
+    return {"message": "Roles assigned to user", "assigned": assigned}
+
+
 @router.delete("/users/{user_id}/roles/{role_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def revoke_role_from_user(
     user_id: UUID,
     role_id: UUID,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser),
+    rbac: RBACService = Depends(get_rbac),
+    audit: AuditService = Depends(get_audit),
+    current_user: TokenClaims = Depends(get_current_active_superuser),
 ) -> None:
     """Revoke a role from a user."""
-    rbac = RBACService(db)
-    audit = AuditService(db)
-
     if not await rbac.revoke_role_from_user(user_id, role_id):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User-role assignment not found",
-        )
-    await db.commit()
+        raise _USER_ROLE_NOT_FOUND.with_traceback(None)
 
-    await audit.log(
+    await _commit_invalidating_permissions(db, [user_id])
+
+    await audit.log_async(
         action=AuditAction.ROLE_REVOKE,
         resource_type=ResourceType.USER,
         resource_id=str(user_id),
-        user_id=current_user.id,
+        user_id=current_user.user_id,
         details={"role_id": str(role_id)},
-        ip_address=get_client_ip(request),
-        user_agent=request.headers.get("User-Agent"),
+        ip_address=request.state.client_ip,
+        user_agent=request.state.user_agent,
     )
-    await db.commit()
 
 
-@router.get("/users/{user_id}/roles", response_model=list[RoleResponse])
+@router.get("/users/{user_id}/roles", responses={200: {"model": list[RoleResponse]}})
 async def get_user_roles(
     user_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser),
-) -> list[RoleResponse]:
+    rbac: RBACService = Depends(get_rbac),
+    current_user: TokenClaims = Depends(get_current_active_superuser),
+) -> ORJSONResponse:
     """Get all roles for a user."""
-    rbac = RBACService(db)
+    # Rows already have the RoleResponse shape; orjson serializes them directly
     roles = await rbac.get_user_roles(user_id)
-    return [RoleResponse.model_validate(r) for r in roles]
+    return ORJSONResponse(content=[dict(r) for r in roles])
 
 
 @router.get("/users/{user_id}/permissions", response_model=list[str])
 async def get_user_permissions(
     user_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser),
+    rbac: RBACService = Depends(get_rbac),
+    current_user: TokenClaims = Depends(get_current_active_superuser),
 ) -> list[str]:
     """Get all permission codes for a user."""
-    rbac = RBACService(db)
     return await rbac.get_user_permissions(user_id)
@@ -3,9 +3,8 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import TokenClaims, get_audit, get_current_claims
 from app.core.database import get_db
-from app.models.user import User
 from app.schemas.auth import (
     LoginRequest,
     LoginResponse,
@@ -27,17 +26,50 @@ from app.services.audit_service import AuditAction, AuditService, ResourceType
 from app.services.auth_service import AuthService
 from app.services.login_tracker import LoginTracker
 from app.services.password_service import PasswordService
+from app.services.token_revocation import revoke_token
 from app.services.totp_service import TOTPService
 
 router = APIRouter()
 
+# Prebuilt errors for the login and credential paths (see app.api.deps)
+_LOCKED_OUT = HTTPException(
+    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+    detail="Too many failed login attempts. Please try again later.",
+)
+_INVALID_CREDENTIALS = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Invalid email or password",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+_INVALID_PHONE_CREDENTIALS = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Invalid phone number or PIN",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+_INVALID_REFRESH_TOKEN = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Invalid or expired refresh token",
+)
+_INVALID_TOTP_CODE = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Invalid TOTP code",
+)
+_INVALID_RESET_TOKEN = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Invalid or expired reset token",
+)
+_WRONG_PASSWORD = HTTPException(
+    status_code=status.HTTP_400_BAD_REQUEST,
+    detail="Current password is incorrect",
+)
 
-def get_client_ip(request: Request) -> str:
-    """Extract client IP from request."""
-    forwarded = request.headers.get("X-Forwarded-For")
-    if forwarded:
-        return forwarded.split(",")[0].strip()
-    return request.client.host if request.client else "unknown"
+# Fixed response bodies, likewise built once
+_TWO_FACTOR_REQUIRED = TwoFactorRequiredResponse()
+_RESET_REQUESTED = MessageResponse(
+    message="If an account exists with this email, a password reset link will be sent."
+)
+_RESET_COMPLETE = MessageResponse(message="Password has been reset successfully.")
+_PASSWORD_CHANGED = MessageResponse(message="Password changed successfully.")
 
 
 @router.post("/register", response_model=LoginResponse, status_code=status.HTTP_201_CREATED)
@@ -45,6 +77,7 @@ async def register(
     request_data: RegisterRequest,
     request: Request,
     db: AsyncSession = Depends(get_db),
+    audit: AuditService = Depends(get_audit),
 ) -> LoginResponse:
     """Register a new user account."""
     import logging
@@ -52,19 +85,19 @@ async def register(
     logger = logging.getLogger(__name__)
 
     service = AuthService(db)
-    audit = AuditService(db)
 
     try:
         result = await service.register(request_data)
+        await db.commit()
 
         try:
-            await audit.log(
+            await audit.log_async(
                 action=AuditAction.REGISTER,
                 resource_type=ResourceType.USER,
                 resource_id=result.user_id,
                 details={"email": request_data.email},
-                ip_address=get_client_ip(request),
-                user_agent=request.headers.get("User-Agent"),
+                ip_address=request.state.client_ip,
+                user_agent=request.state.user_agent,
             )
         except Exception as audit_error:
             # Log audit error but don't fail registration
@@ -86,6 +119,7 @@ async def register_phone(
     request_data: PhoneRegisterRequest,
     request: Request,
     db: AsyncSession = Depends(get_db),
+    audit: AuditService = Depends(get_audit),
 ) -> LoginResponse:
     """Register a new farmer account using phone number and PIN."""
     import logging
@@ -93,19 +127,19 @@ async def register_phone(
     logger = logging.getLogger(__name__)
 
     service = AuthService(db)
-    audit = AuditService(db)
 
     try:
         result = await service.register_phone(request_data)
+        await db.commit()
 
         try:
-            await audit.log(
+            await audit.log_async(
                 action=AuditAction.REGISTER,
                 resource_type=ResourceType.USER,
                 resource_id=result.user_id,
                 details={"phone_number": request_data.phone_number, "method": "phone_pin"},
-                ip_address=get_client_ip(request),
-                user_agent=request.headers.get("User-Agent"),
+                ip_address=request.state.client_ip,
+                user_agent=request.state.user_agent,
             )
         except Exception as audit_error:
             logger.warning(f"Audit logging failed: {audit_error}")
@@ -126,14 +160,14 @@ async def login(
     request_data: LoginRequest,
     request: Request,
     db: AsyncSession = Depends(get_db),
+    audit: AuditService = Depends(get_audit),
 ) -> LoginResponse | TwoFactorRequiredResponse:
     """Authenticate user and return tokens."""
     service = AuthService(db)
     tracker = LoginTracker(db)
-    audit = AuditService(db)
 
-    ip_address = get_client_ip(request)
-    user_agent = request.headers.get("User-Agent")
+    ip_address = request.state.client_ip
+    user_agent = request.state.user_agent
 
     # Check for lockout
     if await tracker.is_locked_out(request_data.email, ip_address):
@@ -144,11 +178,7 @@ async def login(
             user_agent=user_agent,
             failure_reason="account_locked",
         )
-        await db.commit()  # Commit lockout attempt before raising exception
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Too many failed login attempts. Please try again later.",
-        )
+        raise _LOCKED_OUT.with_traceback(None)
 
     result = await service.login(request_data.email, request_data.password, request_data.totp_code)
 
@@ -160,22 +190,17 @@ async def login(
             user_agent=user_agent,
             failure_reason="invalid_credentials",
         )
-        await audit.log(
+        await audit.log_async(
             action=AuditAction.LOGIN_FAILED,
             resource_type=ResourceType.USER,
             details={"email": request_data.email, "reason": "invalid_credentials"},
             ip_address=ip_address,
             user_agent=user_agent,
         )
-        await db.commit()  # Commit failed attempt before raising exception
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid email or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _INVALID_CREDENTIALS.with_traceback(None)
 
     if isinstance(result, dict) and result.get("requires_2fa"):
-        return TwoFactorRequiredResponse()
+        return _TWO_FACTOR_REQUIRED
 
     # Successful login
     await tracker.record_attempt(
@@ -184,7 +209,8 @@ async def login(
         success=True,
         user_agent=user_agent,
     )
-    await audit.log(
+    await db.commit()
+    await audit.log_async(
         action=AuditAction.LOGIN_SUCCESS,
         resource_type=ResourceType.USER,
         resource_id=result.user_id,
@@ -201,14 +227,14 @@ async def login_phone(
     request_data: PhoneLoginRequest,
     request: Request,
     db: AsyncSession = Depends(get_db),
+    audit: AuditService = Depends(get_audit),
 ) -> LoginResponse:
     """Authenticate farmer with phone number and PIN."""
     service = AuthService(db)
     tracker = LoginTracker(db)
-    audit = AuditService(db)
 
-    ip_address = get_client_ip(request)
-    user_agent = request.headers.get("User-Agent")
+    ip_address = request.state.client_ip
+    user_agent = request.state.user_agent
 
     # Check for lockout using phone number as identifier
     if await tracker.is_locked_out(request_data.phone_number, ip_address):
@@ -219,11 +245,7 @@ async def login_phone(
             user_agent=user_agent,
             failure_reason="account_locked",
         )
-        await db.commit()
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Too many failed login attempts. Please try again later.",
-        )
+        raise _LOCKED_OUT.with_traceback(None)
 
     result = await service.login_phone(request_data.phone_number, request_data.pin)
 
@@ -235,19 +257,14 @@ async def login_phone(
             user_agent=user_agent,
             failure_reason="invalid_credentials",
         )
-        await audit.log(
+        await audit.log_async(
             action=AuditAction.LOGIN_FAILED,
             resource_type=ResourceType.USER,
             details={"phone_number": request_data.phone_number, "reason": "invalid_credentials"},
             ip_address=ip_address,
             user_agent=user_agent,
         )
-        await db.commit()
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid phone number or PIN",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _INVALID_PHONE_CREDENTIALS.with_traceback(None)
 
     # Successful login
     await tracker.record_attempt(
@@ -256,7 +273,8 @@ async def login_phone(
         success=True,
         user_agent=user_agent,
     )
-    await audit.log(
+    await db.commit()
+    await audit.log_async(
         action=AuditAction.LOGIN_SUCCESS,
         resource_type=ResourceType.USER,
         resource_id=result.user_id,
@@ -277,10 +295,7 @@ async def refresh_token(
     service = AuthService(db)
     result = await service.refresh_tokens(request_data.refresh_token)
     if not result:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired refresh token",
-        )
+        raise _INVALID_REFRESH_TOKEN.with_traceback(None)
     return result
 
 
@@ -289,19 +304,22 @@ async def logout(
     request_data: RefreshRequest,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    audit: AuditService = Depends(get_audit),
+    current_user: TokenClaims = Depends(get_current_claims),
 ) -> None:
     """Logout and revoke refresh token."""
     service = AuthService(db)
-    audit = AuditService(db)
 
     await service.logout(request_data.refresh_token)
-    await audit.log(
+    await db.commit()
+    if current_user.jti and current_user.expires_at:
+        await revoke_token(current_user.jti, current_user.expires_at)
+    await audit.log_async(
         action=AuditAction.LOGOUT,
         resource_type=ResourceType.SESSION,
-        user_id=current_user.id,
-        ip_address=get_client_ip(request),
-        user_agent=request.headers.get("User-Agent"),
+        user_id=current_user.user_id,
+        ip_address=request.state.client_ip,
+        user_agent=request.state.user_agent,
     )
 
 
@@ -309,12 +327,12 @@ async def logout(
 @router.post("/2fa/setup", response_model=TOTPSetupResponse)
 async def setup_2fa(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: TokenClaims = Depends(get_current_claims),
 ) -> TOTPSetupResponse:
     """Set up two-factor authentication."""
     service = TOTPService(db)
     try:
-        result = await service.setup_totp(current_user.id)
+        result = await service.setup_totp(current_user.user_id)
         return TOTPSetupResponse(**result)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -325,27 +343,25 @@ async def enable_2fa(
     request_data: TOTPVerifyRequest,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    audit: AuditService = Depends(get_audit),
+    current_user: TokenClaims = Depends(get_current_claims),
 ) -> TOTPStatusResponse:
     """Enable 2FA by verifying the TOTP code."""
     service = TOTPService(db)
-    audit = AuditService(db)
 
-    if await service.verify_and_enable_totp(current_user.id, request_data.code):
-        await audit.log(
+    if await service.verify_and_enable_totp(current_user.user_id, request_data.code):
+        await db.commit()
+        await audit.log_async(
             action=AuditAction.TOTP_ENABLED,
             resource_type=ResourceType.USER,
-            resource_id=str(current_user.id),
-            user_id=current_user.id,
-            ip_address=get_client_ip(request),
-            user_agent=request.headers.get("User-Agent"),
+            resource_id=str(current_user.user_id),
+            user_id=current_user.user_id,
+            ip_address=request.state.client_ip,
+            user_agent=request.state.user_agent,
         )
         return TOTPStatusResponse(enabled=True)
 
-    raise HTTPException(
-        status_code=status.HTTP_400_BAD_REQUEST,
-        detail="Invalid TOTP code",
-    )
+    raise _INVALID_TOTP_CODE.with_traceback(None)
 
 
 @router.post("/2fa/disable", response_model=TOTPStatusResponse)
@@ -353,40 +369,38 @@ async def disable_2fa(
     request_data: TOTPVerifyRequest,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    audit: AuditService = Depends(get_audit),
+    current_user: TokenClaims = Depends(get_current_claims),
 ) -> TOTPStatusResponse:
     """Disable 2FA by verifying current TOTP code."""
     service = TOTPService(db)
-    audit = AuditService(db)
 
     try:
-        if await service.disable_totp(current_user.id, request_data.code):
-            await audit.log(
+        if await service.disable_totp(current_user.user_id, request_data.code):
+            await db.commit()
+            await audit.log_async(
                 action=AuditAction.TOTP_DISABLED,
                 resource_type=ResourceType.USER,
-                resource_id=str(current_user.id),
-                user_id=current_user.id,
-                ip_address=get_client_ip(request),
-                user_agent=request.headers.get("User-Agent"),
+                resource_id=str(current_user.user_id),
+                user_id=current_user.user_id,
+                ip_address=request.state.client_ip,
+                user_agent=request.state.user_agent,
             )
             return TOTPStatusResponse(enabled=False)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    raise HTTPException(
-        status_code=status.HTTP_400_BAD_REQUEST,
-        detail="Invalid TOTP code",
-    )
+    raise _INVALID_TOTP_CODE.with_traceback(None)
 
 
 @router.get("/2fa/status", response_model=TOTPStatusResponse)
 async def get_2fa_status(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: TokenClaims = Depends(get_current_claims),
 ) -> TOTPStatusResponse:
     """Get current 2FA status."""
     service = TOTPService(db)
-    enabled = await service.is_totp_enabled(current_user.id)
+    enabled = await service.is_totp_enabled(current_user.user_id)
     return TOTPStatusResponse(enabled=enabled)
 
 
@@ -396,28 +410,27 @@ async def request_password_reset(
     request_data: PasswordResetRequest,
     request: Request,
     db: AsyncSession = Depends(get_db),
+    audit: AuditService = Depends(get_audit),
 ) -> MessageResponse:
     """Request a password reset email."""
     service = PasswordService(db)
-    audit = AuditService(db)
 
     token = await service.create_reset_token(request_data.email)
 
     # Always return success to prevent email enumeration
     if token:
-        await audit.log(
+        await db.commit()
+        await audit.log_async(
             action=AuditAction.PASSWORD_RESET_REQUEST,
             resource_type=ResourceType.USER,
             details={"email": request_data.email},
-            ip_address=get_client_ip(request),
-            user_agent=request.headers.get("User-Agent"),
+            ip_address=request.state.client_ip,
+            user_agent=request.state.user_agent,
         )
         # In production, send email with token
         # For now, we'll just log it (token would be sent via email)
 
-    return MessageResponse(
-        message="If an account exists with this email, a password reset link will be sent."
-    )
+    return _RESET_REQUESTED
 
 
 @router.post("/password/reset-confirm", response_model=MessageResponse)
@@ -425,29 +438,27 @@ async def confirm_password_reset(
     request_data: PasswordResetConfirm,
     request: Request,
     db: AsyncSession = Depends(get_db),
+    audit: AuditService = Depends(get_audit),
 ) -> MessageResponse:
     """Reset password using token."""
     service = PasswordService(db)
-    audit = AuditService(db)
 
     # Validate token first to get user for audit
     user = await service.validate_reset_token(request_data.token)
 
     if await service.reset_password(request_data.token, request_data.new_password):
-        await audit.log(
+        await db.commit()
+        await audit.log_async(
             action=AuditAction.PASSWORD_RESET_COMPLETE,
             resource_type=ResourceType.USER,
             resource_id=str(user.id) if user else None,
             user_id=user.id if user else None,
-            ip_address=get_client_ip(request),
-            user_agent=request.headers.get("User-Agent"),
+            ip_address=request.state.client_ip,
+            user_agent=request.state.user_agent,
         )
-        return MessageResponse(message="Password has been reset successfully.")
+        return _RESET_COMPLETE
 
-    raise HTTPException(
-        status_code=status.HTTP_400_BAD_REQUEST,
-        detail="Invalid or expired reset token",
-    )
+    raise _INVALID_RESET_TOKEN.with_traceback(None)
 
 
 @router.post("/password/change", response_model=MessageResponse)
@@ -455,26 +466,24 @@ async def change_password(
     request_data: PasswordChangeRequest,
     request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    audit: AuditService = Depends(get_audit),
+    current_user: TokenClaims = Depends(get_current_claims),
 ) -> MessageResponse:
     """Change password for authenticated user."""
     service = PasswordService(db)
-    audit = AuditService(db)
 
     if await service.change_password(
-        current_user.id, request_data.current_password, request_data.new_password
+        current_user.user_id, request_data.current_password, request_data.new_password
     ):
-        await audit.log(
+        await db.commit()
+        await audit.log_async(
             action=AuditAction.PASSWORD_CHANGE,
             resource_type=ResourceType.USER,
-            resource_id=str(current_user.id),
-            user_id=current_user.id,
-            ip_address=get_client_ip(request),
-            user_agent=request.headers.get("User-Agent"),
+            resource_id=str(current_user.user_id),
+            user_id=current_user.user_id,
+            ip_address=request.state.client_ip,
+            user_agent=request.state.user_agent,
         )
-        return MessageResponse(message="Password changed successfully.")
+        return _PASSWORD_CHANGED
 
-    raise HTTPException(
-        status_code=status.HTTP_400_BAD_REQUEST,
-        detail="Current password is incorrect",
-    )
+    raise _WRONG_PASSWORD.with_traceback(None)
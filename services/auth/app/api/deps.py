@@ -1,121 +1,369 @@
 """API dependencies."""
 
-from collections.abc import Callable
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy import select
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload, selectinload
 
 from app.core.database import get_db
-from app.core.security import decode_token
-from app.models.user import User
+from app.core.security import decode_token_cached
+from app.middleware.tenant import get_current_tenant
+from app.models.user import User, UserRole
+from app.services.audit_service import AuditService
+from app.services.permission_cache import permission_cache
 from app.services.rbac_service import RBACService
+from app.services.token_revocation import is_token_revoked
+from app.utils.cache import TTLCache
 
 security = HTTPBearer()
 
+# Fixed error responses, built once. Raised with ``with_traceback(None)`` so a
+# shared instance never accumulates frames from earlier requests.
+_INVALID_TOKEN = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Invalid authentication token",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+_INVALID_TOKEN_PAYLOAD = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Invalid token payload",
+)
+_TOKEN_REVOKED = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Token has been revoked",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+_STALE_TOKEN = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Token is outdated, please sign in again",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+_USER_NOT_FOUND = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="User not found or inactive",
+)
+_NOT_SUPERUSER = HTTPException(
+    status_code=status.HTTP_403_FORBIDDEN,
+    detail="Not enough permissions",
+)
+_TENANT_MISMATCH = HTTPException(
+    status_code=status.HTTP_403_FORBIDDEN,
+    detail="Tenant does not match the authenticated user",
+)
 
-async def get_current_user(
+
+@dataclass(slots=True, frozen=True)
+class TokenClaims:
+    """Identity and access flags carried by a validated access token."""
+
+    user_id: UUID
+    is_superuser: bool
+    is_active: bool
+    jti: str | None
+    issued_at: float | None
+    expires_at: int | None
+    tenant_id: UUID | None = None
+    # Role names at issue time; None for tokens issued without them
+    roles: tuple[str, ...] | None = None
+
+
+def _decode_access_token(credentials: HTTPAuthorizationCredentials) -> dict[str, Any]:
+    """Decode an access token, rejecting anything that is not one."""
+    payload = decode_token_cached(credentials.credentials)
+
+    if not payload or payload.get("type") != "access":
+        raise _INVALID_TOKEN.with_traceback(None)
+    return payload
+
+
+def _token_subject(payload: dict[str, Any]) -> UUID:
+    """Return the token subject (user ID) as a UUID."""
+    try:
+        return UUID(payload["sub"])
+    except (KeyError, TypeError, ValueError):
+        raise _INVALID_TOKEN_PAYLOAD.with_traceback(None) from None
+
+
+def _token_tenant(payload: dict[str, Any]) -> UUID | None:
+    """Return the token's tenant ID, if it carries one."""
+    tenant_id = payload.get("tid")
+    if tenant_id is None:
+        return None
+    try:
+        return UUID(tenant_id)
+    except (TypeError, ValueError):
+        raise _INVALID_TOKEN_PAYLOAD.with_traceback(None) from None
+
+
+def _claims_from_token(credentials: HTTPAuthorizationCredentials) -> TokenClaims:
+    """Verify an access token and read its claims; no I/O.
+
+    Tokens without the account flags predate claims-based authorization;
+    nothing vouches for their account state, so they are rejected and the
+    client must refresh.
+    """
+    payload = _decode_access_token(credentials)
+    if "su" not in payload or "active" not in payload:
+        raise _STALE_TOKEN.with_traceback(None)
+    return TokenClaims(
+        user_id=_token_subject(payload),
+        is_superuser=bool(payload["su"]),
+        is_active=bool(payload["active"]),
+        jti=payload.get("jti"),
+        issued_at=payload.get("iat"),
+        expires_at=payload.get("exp"),
+        tenant_id=_token_tenant(payload),
+        roles=tuple(payload["roles"]) if "roles" in payload else None,
+    )
+
+
+async def _ensure_not_revoked(claims: TokenClaims) -> None:
+    """Reject tokens of inactive users and tokens revoked through Redis."""
+    if not claims.is_active or await is_token_revoked(claims.jti, claims.user_id, claims.issued_at):
+        raise _TOKEN_REVOKED.with_traceback(None)
+
+
+async def get_current_claims(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> TokenClaims:
+    """Get the current user's token claims without touching the database.
+
+    Tokens revoked through Redis are rejected. The result is memoized on
+    ``request.state`` for the rest of the request.
+    """
+    cached = getattr(request.state, "claims", None)
+    if cached is not None:
+        return cached
+
+    claims = _claims_from_token(credentials)
+    await _ensure_not_revoked(claims)
+
+    request.state.claims = claims
+    return claims
+
+
+@dataclass(slots=True, frozen=True)
+class AuthUser:
+    """The columns of the current user needed to authorize a request."""
+
+    id: UUID
+    is_active: bool
+    is_superuser: bool
+    tenant_id: UUID | None
+
+
+# Tokens younger than this are trusted for account state without a lookup
+FRESH_CLAIMS_SECONDS = 60
+
+# Account state per user ID. Entries hold plain values, never ORM instances.
+# Deactivation and superuser changes also revoke the user's tokens, so a
+# stale entry cannot outlive those changes on other workers either.
+_auth_user_cache: TTLCache[UUID, AuthUser] = TTLCache(maxsize=5000, ttl=30)
+
+
+def forget_auth_user(user_id: UUID) -> None:
+    """Drop a user's cached account state in this process."""
+    _auth_user_cache.pop(user_id)
+
+
+async def get_current_user(
+    claims: TokenClaims = Depends(get_current_claims),
     db: AsyncSession = Depends(get_db),
-) -> User:
-    """Get current authenticated user from JWT token."""
-    token = credentials.credentials
-    payload = decode_token(token)
+) -> AuthUser:
+    """Get the current user's live account state.
 
-    if not payload or payload.get("type") != "access":
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication token",
-            headers={"WWW-Authenticate": "Bearer"},
+    A token issued within the last ``FRESH_CLAIMS_SECONDS`` that carries the
+    account claims is trusted as is. Otherwise loads only the columns in
+    ``AuthUser``, in a single query, and caches active users for 30 seconds.
+    Use ``get_current_user_with_roles`` for the full profile.
+    """
+    if (
+        claims.roles is not None
+        and claims.issued_at is not None
+        and time.time() - claims.issued_at <= FRESH_CLAIMS_SECONDS
+    ):
+        return AuthUser(
+            id=claims.user_id,
+            is_active=claims.is_active,
+            is_superuser=claims.is_superuser,
+            tenant_id=claims.tenant_id,
         )
 
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload",
-        )
+    auth_user = _auth_user_cache.get(claims.user_id)
+    if auth_user is not None:
+        return auth_user
 
+    user_id = claims.user_id
     result = await db.execute(
-        select(User).options(selectinload(User.roles)).where(User.id == user_id)
+        lambda_stmt(
+            lambda: select(User.id, User.is_active, User.is_superuser, User.tenant_id).where(
+                User.id == user_id
+            )
+        )
+    )
+    row = result.one_or_none()
+
+    if row is None or not row.is_active:
+        raise _USER_NOT_FOUND.with_traceback(None)
+
+    auth_user = AuthUser(*row)
+    _auth_user_cache.set(claims.user_id, auth_user)
+    return auth_user
+
+
+async def get_current_user_with_roles(
+    claims: TokenClaims = Depends(get_current_claims),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """Get current authenticated user, with roles, from the database.
+
+    Only for endpoints that read the full profile or roles; everything else
+    should depend on ``get_current_claims`` or ``get_current_user``.
+    """
+    user = await db.get(
+        User,
+        claims.user_id,
+        options=[selectinload(User.roles).joinedload(UserRole.role), raiseload("*")],
     )
-    user = result.scalar_one_or_none()
 
     if not user or not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found or inactive",
-        )
+        raise _USER_NOT_FOUND.with_traceback(None)
 
     return user
 
 
 async def get_current_active_superuser(
-    current_user: User = Depends(get_current_user),
-) -> User:
-    """Get current user if they are a superuser."""
-    if not current_user.is_superuser:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions",
-        )
-    return current_user
+    claims: TokenClaims = Depends(get_current_claims),
+) -> TokenClaims:
+    """Get current user's claims if they are a superuser."""
+    if not claims.is_superuser:
+        raise _NOT_SUPERUSER.with_traceback(None)
+    return claims
 
 
-def require_permission(permission_code: str) -> Callable:
-    """Dependency factory for permission-based access control."""
+async def get_tenant_id(request: Request) -> UUID | None:
+    """Dependency for the request's tenant ID, if it sent one."""
+    return get_current_tenant(request)
 
-    async def permission_checker(
-        current_user: User = Depends(get_current_user),
-        db: AsyncSession = Depends(get_db),
-    ) -> User:
-        """Check if user has the required permission."""
-        rbac = RBACService(db)
-        if not await rbac.has_permission(current_user.id, permission_code):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Permission '{permission_code}' required",
-            )
-        return current_user
 
-    return permission_checker
+async def get_user_tenant_id(
+    request: Request,
+    claims: TokenClaims = Depends(get_current_claims),
+) -> UUID | None:
+    """Dependency for the tenant to scope the current user's queries to.
 
+    Taken from the token's signed ``tid`` claim, never from the client. An
+    ``X-Tenant-ID`` header naming another tenant is rejected; users without
+    a tenant may send one to narrow results to that tenant.
+    """
+    requested = get_current_tenant(request)
+    if claims.tenant_id is None:
+        return requested
+    if requested is not None and requested != claims.tenant_id:
+        raise _TENANT_MISMATCH.with_traceback(None)
+    return claims.tenant_id
 
-def require_any_permission(permission_codes: list[str]) -> Callable:
-    """Dependency factory for checking any of the given permissions."""
 
-    async def permission_checker(
-        current_user: User = Depends(get_current_user),
-        db: AsyncSession = Depends(get_db),
-    ) -> User:
-        """Check if user has any of the required permissions."""
-        rbac = RBACService(db)
-        if not await rbac.has_any_permission(current_user.id, permission_codes):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"One of these permissions required: {', '.join(permission_codes)}",
-            )
-        return current_user
+async def get_rbac(db: AsyncSession = Depends(get_db)) -> RBACService:
+    """Dependency for the request's RBACService, shared by all its dependents."""
+    return RBACService(db)
 
-    return permission_checker
 
+async def get_audit(db: AsyncSession = Depends(get_db)) -> AuditService:
+    """Dependency for the request's AuditService."""
+    return AuditService(db)
 
-def require_all_permissions(permission_codes: list[str]) -> Callable:
-    """Dependency factory for checking all given permissions."""
 
-    async def permission_checker(
-        current_user: User = Depends(get_current_user),
-        db: AsyncSession = Depends(get_db),
-    ) -> User:
-        """Check if user has all of the required permissions."""
-        rbac = RBACService(db)
-        if not await rbac.has_all_permissions(current_user.id, permission_codes):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"All of these permissions required: {', '.join(permission_codes)}",
+async def _permission_flags(user_id: UUID, codes: list[str], rbac: RBACService) -> list[bool]:
+    """Check which of ``codes`` a user holds, via the permission cache."""
+    flags = await permission_cache.check(user_id, codes)
+    if flags is None:
+        generation = await permission_cache.generation(user_id)
+        granted = await rbac.get_user_permission_codes(user_id)
+        await permission_cache.set_codes(user_id, granted, generation)
+        flags = [code in granted for code in codes]
+    return flags
+
+
+class PermissionChecker:
+    """Dependency that requires the current user to hold permission codes.
+
+    With ``require_all`` every code is needed, otherwise any one of them.
+    Instances are built once, at route definition time.
+    """
+
+    __slots__ = ("codes", "require_all", "error")
+
+    def __init__(self, codes: list[str], require_all: bool, detail: str) -> None:
+        self.codes = list(codes)
+        self.require_all = require_all
+        self.error = HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+
+    async def __call__(
+        self,
+        request: Request,
+        credentials: HTTPAuthorizationCredentials = Depends(security),
+        rbac: RBACService = Depends(get_rbac),
+    ) -> TokenClaims:
+        """Check the current user's permissions.
+
+        Unless another dependency already validated the token, the revocation
+        check and the permission lookup are independent round-trips, so they
+        run concurrently.
+        """
+        current_user = getattr(request.state, "claims", None)
+        if current_user is not None:
+            flags = await _permission_flags(current_user.user_id, self.codes, rbac)
+        else:
+            current_user = _claims_from_token(credentials)
+            # Let both finish before raising, so no query is left running on
+            # the session when the request unwinds
+            revoked, flags = await asyncio.gather(
+                _ensure_not_revoked(current_user),
+                _permission_flags(current_user.user_id, self.codes, rbac),
+                return_exceptions=True,
             )
+            if isinstance(revoked, BaseException):
+                raise revoked
+            if isinstance(flags, BaseException):
+                raise flags
+            request.state.claims = current_user
+
+        if not (all(flags) if self.require_all else any(flags)):
+            raise self.error.with_traceback(None)
         return current_user
 
-    return permission_checker
+
+def require_permission(permission_code: str) -> PermissionChecker:
+    """Dependency factory for permission-based access control."""
+    return PermissionChecker(
+        [permission_code],
+        require_all=True,
+        detail=f"Permission '{permission_code}' required",
+    )
+
+
+def require_any_permission(permission_codes: list[str]) -> PermissionChecker:
+    """Dependency factory for checking any of the given permissions."""
+    return PermissionChecker(
+        permission_codes,
+        require_all=False,
+        detail=f"One of these permissions required: {', '.join(permission_codes)}",
+    )
+
+
+def require_all_permissions(permission_codes: list[str]) -> PermissionChecker:
+    """Dependency factory for checking all given permissions."""
+    return PermissionChecker(
+        permission_codes,
+        require_all=True,
+        detail=f"All of these permissions required: {', '.join(permission_codes)}",
+    )
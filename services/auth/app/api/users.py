@@ -5,7 +5,15 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import (
+    AuthUser,
+    TokenClaims,
+    get_current_claims,
+    get_current_user,
+    get_current_user_with_roles,
+    get_user_tenant_id,
+    require_permission,
+)
 from app.core.database import get_db
 from app.models.user import User
 from app.schemas.user import UserListResponse, UserResponse, UserUpdate
@@ -16,85 +24,56 @@ router = APIRouter()
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_with_roles),
 ) -> UserResponse:
     """Get current authenticated user info."""
-    return UserResponse(
-        id=current_user.id,
-        email=current_user.email,
-        first_name=current_user.first_name,
-        last_name=current_user.last_name,
-        phone_number=current_user.phone_number,
-        national_id=current_user.national_id,
-        is_active=current_user.is_active,
-        is_verified=current_user.is_verified,
-        roles=[ur.role.name for ur in current_user.roles],
-        created_at=current_user.created_at,
-        last_login=current_user.last_login,
-    )
+    return UserResponse.model_validate(current_user)
 
 
 @router.patch("/me", response_model=UserResponse)
 async def update_current_user(
     update_data: UserUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthUser = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> UserResponse:
     """Update current user profile."""
     service = UserService(db)
     user = await service.update_user(current_user.id, update_data)
-    return UserResponse(
-        id=user.id,
-        email=user.email,
-        first_name=user.first_name,
-        last_name=user.last_name,
-        phone_number=user.phone_number,
-        national_id=user.national_id,
-        is_active=user.is_active,
-        is_verified=user.is_verified,
-        roles=[ur.role.name for ur in user.roles],
-        created_at=user.created_at,
-        last_login=user.last_login,
-    )
+    return UserResponse.model_validate(user)
 
 
 @router.get("", response_model=UserListResponse)
 async def list_users(
-    page: int = Query(1, ge=1),
+    cursor: str | None = Query(None),
     page_size: int = Query(20, ge=1, le=100),
+    tenant_id: UUID | None = Depends(get_user_tenant_id),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: TokenClaims = Depends(require_permission("users:read")),
 ) -> UserListResponse:
-    """List all users (admin only)."""
-    # TODO: Add admin role check
+    """List all users; requires the ``users:read`` permission.
+
+    Pages are keyset-based: pass the previous page's ``next_cursor`` as
+    ``cursor`` to fetch the next one. Scoped to the caller's tenant, if any.
+    """
     service = UserService(db)
-    return await service.list_users(page=page, page_size=page_size)
+    try:
+        return await service.list_users(cursor=cursor, page_size=page_size, tenant_id=tenant_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: UUID,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: TokenClaims = Depends(get_current_claims),
 ) -> UserResponse:
     """Get user by ID."""
     service = UserService(db)
-    user = await service.get_user(user_id)
+    user = await service.get_user_with_roles(user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
-    return UserResponse(
-        id=user.id,
-        email=user.email,
-        first_name=user.first_name,
-        last_name=user.last_name,
-        phone_number=user.phone_number,
-        national_id=user.national_id,
-        is_active=user.is_active,
-        is_verified=user.is_verified,
-        roles=[ur.role.name for ur in user.roles],
-        created_at=user.created_at,
-        last_login=user.last_login,
-    )
+    return UserResponse.model_validate(user)
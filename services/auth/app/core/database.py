@@ -1,9 +1,15 @@
 """Database connection and session management."""
 
+import asyncio
 from collections.abc import AsyncGenerator
+from typing import Any
 
+from sqlalchemy import Dialect, event, text
+from sqlalchemy.engine.interfaces import DBAPIConnection
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import ConnectionPoolEntry
 
 from app.core.config import settings
 
@@ -11,10 +17,39 @@ engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    connect_args={
+        "timeout": settings.db_connect_timeout,
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+        # JIT compilation only slows down short OLTP queries like these
+        "server_settings": {"jit": "off"},
+    },
 )
 
+
+@event.listens_for(engine.sync_engine, "do_connect")
+def _connect(
+    dialect: Dialect,
+    conn_rec: ConnectionPoolEntry,
+    cargs: tuple[Any, ...],
+    cparams: dict[str, Any],
+) -> DBAPIConnection:
+    """Open a DBAPI connection, reporting a connect timeout as a pool timeout.
+
+    asyncpg raises the builtin TimeoutError when ``db_connect_timeout``
+    elapses. Re-raising it as SQLAlchemy's pool TimeoutError lets the app
+    answer 503 for both ways of failing to get a connection, without
+    treating every other TimeoutError as a database outage.
+    """
+    try:
+        return dialect.connect(*cargs, **cparams)
+    except TimeoutError as exc:
+        raise PoolTimeoutError("Timed out connecting to the database") from exc
+
+
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -30,6 +65,16 @@ class Base(DeclarativeBase):
     pass
 
 
+async def warm_pool(size: int) -> None:
+    """Open ``size`` pooled connections up front so early requests skip connect."""
+
+    async def _open() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(_open() for _ in range(min(size, settings.db_pool_size))))
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency for getting async database sessions."""
     async with async_session_maker() as session:
@@ -0,0 +1,13 @@
+"""Redis connection management."""
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+# Connections are opened lazily on first command
+redis_client: Redis = Redis.from_url(settings.redis_url, decode_responses=True)
+
+
+async def get_redis() -> Redis:
+    """Dependency for getting the shared Redis client."""
+    return redis_client
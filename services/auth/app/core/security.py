@@ -1,15 +1,34 @@
 """Security utilities for authentication and authorization."""
 
+import functools
+import hashlib
+import time
+import uuid
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.utils.cache import TTLCache
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=12)
 
+# Verified access-token payloads keyed by a digest of the raw token
+_decode_cache: TTLCache[bytes, dict[str, Any]] = TTLCache(maxsize=10_000, ttl=30)
+
+
+@functools.lru_cache(maxsize=4)
+def _jwt_key(secret: str, algorithm: str) -> Key:
+    """Build the JWT signing/verification key once per secret and algorithm.
+
+    Given a raw secret, python-jose tries to parse it as a JWK and constructs
+    a new key object on every encode and decode; a prebuilt ``Key`` skips both.
+    """
+    return jwk.construct(secret, algorithm)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
@@ -22,27 +41,76 @@ def hash_password(password: str) -> str:
 
 
 def create_access_token(data: dict[str, Any], expires_delta: timedelta | None = None) -> str:
-    """Create a JWT access token."""
+    """Create a JWT access token.
+
+    Every access token carries ``iat`` and a unique ``jti`` so it can be
+    revoked individually or by issue time. ``iat`` keeps sub-second precision
+    (NumericDate allows fractions), so a revocation cutoff can tell apart
+    tokens issued just before and just after it within the same second.
+    """
     to_encode = data.copy()
-    expire = datetime.now(UTC) + (
-        expires_delta or timedelta(minutes=settings.access_token_expire_minutes)
+    now = datetime.now(UTC)
+    expire = now + (expires_delta or timedelta(minutes=settings.access_token_expire_minutes))
+    to_encode.update(
+        {"exp": expire, "iat": now.timestamp(), "jti": uuid.uuid4().hex, "type": "access"}
+    )
+    return jwt.encode(
+        to_encode,
+        _jwt_key(settings.jwt_secret_key, settings.jwt_algorithm),
+        algorithm=settings.jwt_algorithm,
     )
-    to_encode.update({"exp": expire, "type": "access"})
-    return jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
 
 
 def create_refresh_token(data: dict[str, Any]) -> str:
     """Create a JWT refresh token."""
     to_encode = data.copy()
     expire = datetime.now(UTC) + timedelta(days=settings.refresh_token_expire_days)
-    to_encode.update({"exp": expire, "type": "refresh"})
-    return jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    # jti keeps tokens minted for the same user in the same second distinct
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex, "type": "refresh"})
+    return jwt.encode(
+        to_encode,
+        _jwt_key(settings.jwt_secret_key, settings.jwt_algorithm),
+        algorithm=settings.jwt_algorithm,
+    )
+
+
+def hash_token(token: str) -> bytes:
+    """Hash a refresh or password-reset token for storage and lookup.
+
+    Returns the raw 32-byte SHA-256 digest, stored as-is in ``bytea``
+    columns: half the index key width of the hex form, with no hex string
+    allocated per lookup.
+    """
+    return hashlib.sha256(token.encode()).digest()
 
 
 def decode_token(token: str) -> dict[str, Any] | None:
     """Decode and validate a JWT token."""
     try:
-        payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+        payload = jwt.decode(
+            token,
+            _jwt_key(settings.jwt_secret_key, settings.jwt_algorithm),
+            algorithms=[settings.jwt_algorithm],
+        )
         return payload
     except JWTError:
         return None
+
+
+def decode_token_cached(token: str) -> dict[str, Any] | None:
+    """Decode and validate an access token, reusing recent verifications.
+
+    Verified access-token payloads are kept in a small in-process LRU keyed
+    by a truncated SHA-256 digest of the token, so a client repeating the same token
+    pays for signature verification at most once every 30 seconds. Entries
+    never outlive the token's ``exp``. Invalid tokens are not cached.
+    """
+    key = hashlib.sha256(token.encode()).digest()[:16]
+    payload = _decode_cache.get(key)
+    if payload is not None:
+        return payload
+
+    payload = decode_token(token)
+    if payload is not None and payload.get("type") == "access" and "exp" in payload:
+        _decode_cache.set(key, payload, ttl=payload["exp"] - time.time())
+    return payload
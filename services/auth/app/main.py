@@ -1,17 +1,30 @@
 """Main application entry point for Auth Service."""
 
+import asyncio
 from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from starlette.routing import Route
 
 # Import all models to ensure they're registered with Base.metadata
 import app.models.user  # noqa: F401
 from app.api import router as api_router
 from app.core.config import settings
 from app.core.logging import configure_logging
+from app.core.redis import redis_client
+from app.middleware.client_context import ClientContextMiddleware
 from app.middleware.tenant import TenantMiddleware
+from app.services.audit_service import audit_sink
+from app.services.auth_service import dummy_password_hash
+from app.services.login_tracker import login_attempt_sink
+
+# pg_advisory_xact_lock key held while creating tables at startup
+SCHEMA_LOCK_KEY = 0x61757468  # "auth"
 
 
 @asynccontextmanager
@@ -22,23 +35,69 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Initialize database schema
     import logging
 
-    from app.core.database import Base, engine
+    from app.core.database import Base, engine, warm_pool
 
     logger = logging.getLogger(__name__)
 
+    # Schema is managed by Alembic (see docker-entrypoint.sh); create_all is
+    # a development convenience only
+    if settings.debug or settings.auto_create_schema:
+        try:
+            logger.info("Creating database tables if they don't exist...")
+            async with engine.begin() as conn:
+                if conn.dialect.name == "postgresql":
+                    # Serialize DDL across workers booting at the same time
+                    await conn.execute(
+                        text("SELECT pg_advisory_xact_lock(:key)"),
+                        {"key": SCHEMA_LOCK_KEY},
+                    )
+                await conn.run_sync(Base.metadata.create_all)
+            logger.info("Database tables ready")
+        except Exception as e:
+            logger.error(f"Error initializing database: {e}")
+
     try:
-        logger.info("Creating database tables if they don't exist...")
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
-        logger.info("Database tables ready")
+        await warm_pool(settings.db_pool_min_size)
     except Exception as e:
-        logger.error(f"Error initializing database: {e}")
+        logger.warning(f"Could not pre-open database connections: {e}")
+
+    # Hash the unknown-account password now, not on the first login for one
+    await asyncio.to_thread(dummy_password_hash)
+
+    # Background writers for audit log and login attempt rows
+    sink_writers = [
+        asyncio.create_task(audit_sink.run()),
+        asyncio.create_task(login_attempt_sink.run()),
+    ]
 
     yield
     # Cleanup resources
+    for writer in sink_writers:
+        writer.cancel()
+    for writer in sink_writers:
+        with suppress(asyncio.CancelledError):
+            await writer
+    await redis_client.aclose()
     await engine.dispose()
 
 
+async def database_unavailable_handler(request: Request, exc: Exception) -> JSONResponse:
+    """Answer 503 when no database connection could be obtained in time."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Database temporarily unavailable"},
+        headers={"Retry-After": "1"},
+    )
+
+
+_HEALTH_BODY = b'{"status":"healthy","service":"auth"}'
+
+
+async def health_check(request: Request) -> Response:
+    """Health check endpoint."""
+    return Response(_HEALTH_BODY, media_type="application/json")
+
+
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
     app = FastAPI(
@@ -48,6 +107,8 @@ def create_app() -> FastAPI:
         docs_url="/docs" if settings.debug else None,
         redoc_url="/redoc" if settings.debug else None,
         lifespan=lifespan,
+        # orjson encodes UUIDs and datetimes natively
+        default_response_class=ORJSONResponse,
     )
 
     # Configure CORS
@@ -62,13 +123,19 @@ def create_app() -> FastAPI:
     # Add multi-tenancy middleware
     app.add_middleware(TenantMiddleware)
 
+    # Resolve client IP and user agent once per request
+    app.add_middleware(ClientContextMiddleware)
+
+    # Fail fast with 503 instead of queueing behind an exhausted pool
+    # (connect timeouts are re-raised as pool timeouts; see app.core.database)
+    app.add_exception_handler(PoolTimeoutError, database_unavailable_handler)
+
     # Include routers
     app.include_router(api_router, prefix="/api/v1")
 
-    @app.get("/health")
-    async def health_check() -> dict:
-        """Health check endpoint."""
-        return {"status": "healthy", "service": "auth"}
+    # Plain Starlette route, ahead of the API routes: liveness probes skip
+    # FastAPI's dependency solving and response serialization
+    app.router.routes.insert(0, Route("/health", health_check, methods=["GET"]))
 
     return app
 
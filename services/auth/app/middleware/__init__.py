@@ -1,15 +1,15 @@
 """Middleware package."""
 
+from app.middleware.client_context import ClientContextMiddleware
 from app.middleware.tenant import (
     TenantFilter,
     TenantMiddleware,
     get_current_tenant,
-    set_current_tenant,
 )
 
 __all__ = [
+    "ClientContextMiddleware",
     "TenantMiddleware",
     "TenantFilter",
     "get_current_tenant",
-    "set_current_tenant",
 ]
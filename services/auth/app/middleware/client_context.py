@@ -0,0 +1,37 @@
+"""Client context middleware."""
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class ClientContextMiddleware:
+    """Resolve the client IP and user agent once per request.
+
+    Values are stored on ``request.state`` as ``client_ip`` and ``user_agent``
+    so handlers and audit logging read them without re-parsing headers. The
+    first ``X-Forwarded-For`` hop wins over the socket peer address.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            forwarded: bytes | None = None
+            user_agent: bytes | None = None
+            for name, value in scope["headers"]:
+                if name == b"x-forwarded-for":
+                    forwarded = value
+                elif name == b"user-agent":
+                    user_agent = value
+
+            if forwarded:
+                client_ip = forwarded.partition(b",")[0].strip().decode("latin-1")
+            else:
+                client = scope.get("client")
+                client_ip = client[0] if client else "unknown"
+
+            state = scope.setdefault("state", {})
+            state["client_ip"] = client_ip
+            state["user_agent"] = user_agent.decode("latin-1") if user_agent is not None else None
+
+        await self.app(scope, receive, send)
@@ -1,62 +1,78 @@
 """Multi-tenancy middleware."""
 
-from contextvars import ContextVar
 from typing import Any
 from uuid import UUID
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.responses import Response
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-# Context variable to store current tenant
-current_tenant_id: ContextVar[UUID | None] = ContextVar("current_tenant_id", default=None)
 
+def get_current_tenant(request: Request) -> UUID | None:
+    """Get the request's tenant ID, as resolved by ``TenantMiddleware``."""
+    return getattr(request.state, "tenant_id", None)
 
-def get_current_tenant() -> UUID | None:
-    """Get the current tenant ID from context."""
-    return current_tenant_id.get()
 
+_HYPHEN = ord("-")
 
-def set_current_tenant(tenant_id: UUID | None) -> None:
-    """Set the current tenant ID in context."""
-    current_tenant_id.set(tenant_id)
 
+def _parse_uuid_header(value: bytes) -> UUID | None:
+    """Parse a canonical hyphenated UUID header value, or return None.
 
-class TenantMiddleware(BaseHTTPMiddleware):
-    """Middleware for extracting and setting tenant context from requests."""
+    Anything not shaped like ``8-4-4-4-12`` is rejected by length and hyphen
+    positions alone; well-formed values are built from their 16 raw bytes.
+    """
+    if (
+        len(value) != 36
+        or value[8] != _HYPHEN
+        or value[13] != _HYPHEN
+        or value[18] != _HYPHEN
+        or value[23] != _HYPHEN
+    ):
+        return None
+    try:
+        return UUID(bytes=bytes.fromhex(value.replace(b"-", b"").decode("ascii")))
+    except ValueError:
+        return None
 
-    TENANT_HEADER = "X-Tenant-ID"
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        """Extract tenant ID from request and set in context."""
-        tenant_id: UUID | None = None
+class TenantMiddleware:
+    """Middleware for extracting the tenant from request headers.
+
+    The tenant ID (or None) is stored on ``request.state`` as ``tenant_id``
+    and handed to services explicitly. Plain ASGI rather than
+    ``BaseHTTPMiddleware``, so requests do not pay for an extra task and
+    response stream.
+    """
+
+    TENANT_HEADER = b"x-tenant-id"
+    # Tenant-agnostic paths, passed straight through without header parsing
+    SKIP_PATHS = frozenset({"/health", "/docs", "/redoc", "/openapi.json"})
 
-        # Try to get tenant from header
-        tenant_header = request.headers.get(self.TENANT_HEADER)
-        if tenant_header:
-            try:
-                tenant_id = UUID(tenant_header)
-            except ValueError:
-                pass
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-        # Set tenant in context
-        token = current_tenant_id.set(tenant_id)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Extract tenant ID from request headers and store it on the request state."""
+        if scope["type"] != "http" or scope["path"] in self.SKIP_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        tenant_id: UUID | None = None
+        for name, value in scope["headers"]:
+            if name == self.TENANT_HEADER:
+                tenant_id = _parse_uuid_header(value)
+                break
 
-        try:
-            response = await call_next(request)
-            return response
-        finally:
-            # Reset context
-            current_tenant_id.reset(token)
+        scope.setdefault("state", {})["tenant_id"] = tenant_id
+        await self.app(scope, receive, send)
 
 
 class TenantFilter:
     """Mixin for SQLAlchemy queries to filter by tenant."""
 
     @staticmethod
-    def apply_tenant_filter(query: Any, tenant_column: Any) -> Any:
-        """Apply tenant filter to a query if tenant is set."""
-        tenant_id = get_current_tenant()
+    def apply_tenant_filter(query: Any, tenant_column: Any, tenant_id: UUID | None) -> Any:
+        """Apply tenant filter to a query if a tenant is given."""
         if tenant_id:
             return query.where(tenant_column == tenant_id)
         return query
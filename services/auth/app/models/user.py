@@ -4,7 +4,17 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, Text, func
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    LargeBinary,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -40,7 +50,7 @@ class User(Base):
     totp_enabled: Mapped[bool] = mapped_column(Boolean, default=False)
 
     # Tenant
-    tenant_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), index=True)
+    tenant_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
 
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -49,13 +59,29 @@ class User(Base):
     )
     last_login: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
-    # Relationships
-    roles: Mapped[list["UserRole"]] = relationship("UserRole", back_populates="user")
+    # Relationships. Lazy loads raise, so every access must be eager-loaded;
+    # the child rows are removed by ON DELETE CASCADE, not loaded to delete.
+    roles: Mapped[list["UserRole"]] = relationship(
+        "UserRole", back_populates="user", lazy="raise_on_sql", passive_deletes=True
+    )
     refresh_tokens: Mapped[list["RefreshToken"]] = relationship(
-        "RefreshToken", back_populates="user"
+        "RefreshToken", back_populates="user", lazy="raise_on_sql", passive_deletes=True
     )
 
 
+# Serves keyset pagination ordered by (created_at DESC, id DESC). No INCLUDE
+# list: listings read more columns than it could sensibly cover, and every
+# included column would cost HOT updates on edits to it.
+Index("ix_users_created_at_id", User.created_at.desc(), User.id.desc())
+
+
+# Tenant-scoped lookups filter on tenant_id first; these composites replace a
+# plain tenant_id index. Email stays globally unique, since login looks
+# users up by email alone.
+Index("ix_users_tenant_email", User.tenant_id, User.email)
+Index("ix_users_tenant_active", User.tenant_id, postgresql_where=User.is_active)
+
+
 class Role(Base):
     """Role model for RBAC."""
 
@@ -67,18 +93,29 @@ class Role(Base):
     permissions: Mapped[str] = mapped_column(Text, default="[]")  # JSON array of permissions
 
     # Tenant-specific or global
-    tenant_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), index=True)
+    tenant_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
     is_system_role: Mapped[bool] = mapped_column(Boolean, default=False)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
-    users: Mapped[list["UserRole"]] = relationship("UserRole", back_populates="role")
+    users: Mapped[list["UserRole"]] = relationship(
+        "UserRole", back_populates="role", lazy="raise_on_sql", passive_deletes=True
+    )
+
+
+Index("ix_roles_tenant_name", Role.tenant_id, Role.name)
 
 
 class UserRole(Base):
     """Association table for User-Role many-to-many relationship."""
 
     __tablename__ = "user_roles"
+    __table_args__ = (
+        UniqueConstraint("user_id", "role_id", name="uq_user_roles_user_role"),
+        # The unique constraint serves lookups by user; this one serves the
+        # holders of a role and cascading role deletes
+        Index("ix_user_roles_role_user", "role_id", "user_id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(
@@ -93,8 +130,8 @@ class UserRole(Base):
     )
     assigned_by: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
 
-    user: Mapped["User"] = relationship("User", back_populates="roles")
-    role: Mapped["Role"] = relationship("Role", back_populates="users")
+    user: Mapped["User"] = relationship("User", back_populates="roles", lazy="raise_on_sql")
+    role: Mapped["Role"] = relationship("Role", back_populates="users", lazy="raise_on_sql")
 
 
 class RefreshToken(Base):
@@ -106,7 +143,7 @@ class RefreshToken(Base):
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
-    token_hash: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+    token_hash: Mapped[bytes] = mapped_column(LargeBinary(32), unique=True, nullable=False)
     device_info: Mapped[str | None] = mapped_column(String(255))
     ip_address: Mapped[str | None] = mapped_column(String(45))
 
@@ -114,7 +151,9 @@ class RefreshToken(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     revoked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
-    user: Mapped["User"] = relationship("User", back_populates="refresh_tokens")
+    user: Mapped["User"] = relationship(
+        "User", back_populates="refresh_tokens", lazy="raise_on_sql"
+    )
 
 
 class PasswordResetToken(Base):
@@ -126,7 +165,7 @@ class PasswordResetToken(Base):
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
-    token_hash: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+    token_hash: Mapped[bytes] = mapped_column(LargeBinary(32), unique=True, nullable=False)
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     used_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
@@ -148,6 +187,22 @@ class LoginAttempt(Base):
     )
 
 
+# Failure counts per identifier or IP only look at recent failed attempts;
+# partial indexes keep successful logins, the bulk of the table, out of them.
+Index(
+    "ix_login_attempts_failed_email",
+    LoginAttempt.email,
+    LoginAttempt.attempted_at.desc(),
+    postgresql_where=~LoginAttempt.success,
+)
+Index(
+    "ix_login_attempts_failed_ip",
+    LoginAttempt.ip_address,
+    LoginAttempt.attempted_at.desc(),
+    postgresql_where=~LoginAttempt.success,
+)
+
+
 class AuditLog(Base):
     """Immutable audit log for compliance."""
 
@@ -187,6 +242,9 @@ class RolePermission(Base):
     """Association table for Role-Permission relationship."""
 
     __tablename__ = "role_permissions"
+    __table_args__ = (
+        UniqueConstraint("role_id", "permission_id", name="uq_role_permissions_role_permission"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     role_id: Mapped[uuid.UUID] = mapped_column(
@@ -65,12 +65,24 @@ class RolePermissionAssign(BaseModel):
     permission_id: UUID
 
 
+class RolePermissionsAssign(BaseModel):
+    """Assign several permissions to a role at once."""
+
+    permission_ids: list[UUID] = Field(..., min_length=1, max_length=500)
+
+
 class UserRoleAssign(BaseModel):
     """Assign role to user."""
 
     role_id: UUID
 
 
+class UserRolesAssign(BaseModel):
+    """Assign several roles to a user at once."""
+
+    role_ids: list[UUID] = Field(..., min_length=1, max_length=100)
+
+
 # User management schemas
 class AdminUserCreate(BaseModel):
     """Admin create user request."""
@@ -111,10 +123,11 @@ class UserUpdate(BaseModel):
 
 
 class UserListResponse(BaseModel):
-    """Paginated user list response."""
+    """Keyset-paginated user list response."""
 
     items: list[UserResponse]
-    total: int
-    page: int
+    total: int | None = None
     size: int
-    pages: int
+    pages: int | None = None
+    next_cursor: str | None = None
+    has_next: bool = False
@@ -1,15 +1,35 @@
 """Authentication schemas."""
 
 from datetime import datetime
+from typing import Annotated
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import AfterValidator, BaseModel, Field, StringConstraints
+
+
+def _lower_domain(value: str) -> str:
+    """Lowercase the domain part, the one normalization EmailStr applied."""
+    local, _, domain = value.rpartition("@")
+    return f"{local}@{domain.lower()}"
+
+
+# A syntactic check for the auth endpoints, which see most of the traffic;
+# schemas that need full RFC validation keep using EmailStr.
+Email = Annotated[
+    str,
+    StringConstraints(strip_whitespace=True, max_length=254, pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$"),
+    AfterValidator(_lower_domain),
+]
+
+# Constrained types shared by the phone-number schemas
+PhoneStr = Annotated[str, StringConstraints(pattern=r"^\+?[1-9]\d{1,14}$")]
+PinStr = Annotated[str, StringConstraints(min_length=4, max_length=4, pattern=r"^\d{4}$")]
 
 
 class LoginRequest(BaseModel):
     """Login request schema."""
 
-    email: EmailStr
+    email: Email
     password: str = Field(..., min_length=8)
     totp_code: str | None = Field(None, min_length=6, max_length=6)
 
@@ -51,11 +71,11 @@ class RefreshRequest(BaseModel):
 class RegisterRequest(BaseModel):
     """User registration request."""
 
-    email: EmailStr
+    email: Email
     password: str = Field(..., min_length=8)
     first_name: str = Field(..., min_length=1, max_length=100)
     last_name: str = Field(..., min_length=1, max_length=100)
-    phone_number: str | None = Field(None, pattern=r"^\+?[1-9]\d{1,14}$")
+    phone_number: PhoneStr | None = None
     national_id: str | None = None
 
 
@@ -64,15 +84,15 @@ class PhoneRegisterRequest(BaseModel):
 
     first_name: str = Field(..., min_length=1, max_length=100)
     last_name: str = Field(..., min_length=1, max_length=100)
-    phone_number: str = Field(..., pattern=r"^\+?[1-9]\d{1,14}$")
-    pin: str = Field(..., min_length=4, max_length=4, pattern=r"^\d{4}$")
+    phone_number: PhoneStr
+    pin: PinStr
 
 
 class PhoneLoginRequest(BaseModel):
     """Phone+PIN login for mobile farmers."""
 
-    phone_number: str = Field(..., pattern=r"^\+?[1-9]\d{1,14}$")
-    pin: str = Field(..., min_length=4, max_length=4, pattern=r"^\d{4}$")
+    phone_number: PhoneStr
+    pin: PinStr
 
 
 # Two-Factor Authentication schemas
@@ -100,7 +120,7 @@ class TOTPStatusResponse(BaseModel):
 class PasswordResetRequest(BaseModel):
     """Request password reset."""
 
-    email: EmailStr
+    email: Email
 
 
 class PasswordResetConfirm(BaseModel):
@@ -123,41 +143,7 @@ class MessageResponse(BaseModel):
     message: str
 
 
-# Role and Permission schemas
-class RoleCreate(BaseModel):
-    """Create role request."""
-
-    name: str = Field(..., min_length=1, max_length=50)
-    description: str | None = None
-    tenant_id: UUID | None = None
-
-
-class RoleResponse(BaseModel):
-    """Role response."""
-
-    id: UUID
-    name: str
-    description: str | None
-    tenant_id: UUID | None
-    is_system_role: bool
-    created_at: datetime
-
-    model_config = {"from_attributes": True}
-
-
-class PermissionResponse(BaseModel):
-    """Permission response."""
-
-    id: UUID
-    code: str
-    name: str
-    description: str | None
-    resource: str
-    action: str
-
-    model_config = {"from_attributes": True}
-
-
+# Role assignment schemas (role and permission models live in app.schemas.admin)
 class RoleAssignRequest(BaseModel):
     """Assign role to user request."""
 
@@ -1,9 +1,10 @@
 """User schemas."""
 
 from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, field_validator
 
 
 class UserBase(BaseModel):
@@ -49,12 +50,21 @@ class UserResponse(BaseModel):
 
     model_config = {"from_attributes": True}
 
+    @field_validator("roles", mode="before")
+    @classmethod
+    def role_names(cls, value: Any) -> Any:
+        """Accept a User's loaded UserRole rows as well as plain role names.
+
+        Lets ``model_validate(user)`` read a User with ``roles`` (and each
+        ``UserRole.role``) eager-loaded.
+        """
+        return [item if isinstance(item, str) else item.role.name for item in value]
+
 
 class UserListResponse(BaseModel):
-    """Paginated user list response."""
+    """Keyset-paginated user list response."""
 
     items: list[UserResponse]
-    total: int
-    page: int
     page_size: int
-    pages: int
+    next_cursor: str | None = None
+    has_next: bool = False
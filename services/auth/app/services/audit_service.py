@@ -1,12 +1,127 @@
 """Audit logging service for compliance."""
 
-from typing import Any
+import asyncio
+import logging
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any, Protocol
 from uuid import UUID
 
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import Base, async_session_maker
 from app.models.user import AuditLog
 
+logger = logging.getLogger(__name__)
+
+
+class SinkEvent(Protocol):
+    """A buffered row for an AuditSink."""
+
+    def to_row(self) -> dict[str, Any]:
+        """Return the column values for the INSERT."""
+        ...
+
+
+@dataclass(slots=True)
+class AuditEvent:
+    """An audit log entry waiting to be written by the AuditSink."""
+
+    action: str
+    resource_type: str
+    resource_id: str | None = None
+    user_id: UUID | None = None
+    tenant_id: UUID | None = None
+    details: dict[str, Any] | None = None
+    ip_address: str | None = None
+    user_agent: str | None = None
+
+    def to_row(self) -> dict[str, Any]:
+        """Return the column values for the audit_logs INSERT."""
+        return {
+            "action": self.action,
+            "resource_type": self.resource_type,
+            "resource_id": self.resource_id,
+            "user_id": self.user_id,
+            "tenant_id": self.tenant_id,
+            "details": self.details,
+            "ip_address": self.ip_address,
+            "user_agent": self.user_agent,
+        }
+
+
+class AuditSink:
+    """In-process buffer that writes audit events in multi-row INSERTs.
+
+    Events are inserted into ``model``'s table (``audit_logs`` by default);
+    any event type with a ``to_row()`` method can be buffered. They are
+    written by ``run()``, which is started from the application lifespan. A
+    batch is flushed once it reaches ``batch_size`` events or
+    ``flush_interval`` seconds after its first event, whichever comes first.
+    The queue is bounded; ``submit`` waits for space when it is full.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10_000,
+        batch_size: int = 128,
+        flush_interval: float = 0.05,
+        model: type[Base] = AuditLog,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.model = model
+        self._queue: asyncio.Queue[SinkEvent] = asyncio.Queue(maxsize=maxsize)
+
+    async def submit(self, event: SinkEvent) -> None:
+        """Queue an event; only suspends when the queue is at capacity."""
+        await self._queue.put(event)
+
+    async def run(self) -> None:
+        """Drain the queue in batches until cancelled, then flush what is left."""
+        loop = asyncio.get_running_loop()
+        batch: list[SinkEvent] = []
+        writing: asyncio.Task[None] | None = None
+        try:
+            while True:
+                batch.append(await self._queue.get())
+                deadline = loop.time() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except TimeoutError:
+                        break
+                # Shielded so shutdown never abandons a batch mid-INSERT
+                writing = asyncio.ensure_future(self._write(batch))
+                await asyncio.shield(writing)
+                writing = None
+                batch = []
+        except asyncio.CancelledError:
+            if writing is not None:
+                await writing
+                batch = []
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            if batch:
+                await self._write(batch)
+            raise
+
+    async def _write(self, batch: list[SinkEvent]) -> None:
+        """Insert a batch of events in one statement and one commit."""
+        try:
+            async with async_session_maker() as session:
+                await session.execute(insert(self.model), [event.to_row() for event in batch])
+                await session.commit()
+        except Exception:
+            logger.exception("Failed to write %d %s rows", len(batch), self.model.__tablename__)
+
+
+audit_sink = AuditSink()
+
 
 class AuditService:
     """Service for immutable audit logging."""
@@ -25,7 +140,11 @@ class AuditService:
         ip_address: str | None = None,
         user_agent: str | None = None,
     ) -> AuditLog:
-        """Create an immutable audit log entry."""
+        """Create an immutable audit log entry.
+
+        The entry is only added to the session; it is written by the caller's
+        commit together with the change being audited.
+        """
         audit_log = AuditLog(
             user_id=user_id,
             tenant_id=tenant_id,
@@ -37,12 +156,40 @@ class AuditService:
             user_agent=user_agent,
         )
         self.db.add(audit_log)
-        await self.db.flush()
         return audit_log
 
+    async def log_async(
+        self,
+        action: str,
+        resource_type: str,
+        resource_id: str | None = None,
+        user_id: UUID | None = None,
+        tenant_id: UUID | None = None,
+        details: dict[str, Any] | None = None,
+        ip_address: str | None = None,
+        user_agent: str | None = None,
+    ) -> None:
+        """Hand an audit log entry to the background AuditSink.
+
+        Use only after the audited change has been committed; entries that
+        must be durable with the change itself should go through ``log``.
+        """
+        await audit_sink.submit(
+            AuditEvent(
+                action=action,
+                resource_type=resource_type,
+                resource_id=resource_id,
+                user_id=user_id,
+                tenant_id=tenant_id,
+                details=details,
+                ip_address=ip_address,
+                user_agent=user_agent,
+            )
+        )
+
 
 # Common audit actions
-class AuditAction:
+class AuditAction(StrEnum):
     """Standard audit action constants."""
 
     # Authentication
@@ -69,12 +216,14 @@ class AuditAction:
     ROLE_DELETE = "role.delete"
     ROLE_ASSIGN = "role.assign"
     ROLE_REVOKE = "role.revoke"
+    ROLES_BULK_ASSIGN = "role.bulk_assign"
 
     # Permission management
     PERMISSION_CREATE = "permission.create"
     PERMISSION_GRANT = "permission.grant"
     PERMISSION_ASSIGN = "permission.assign"
     PERMISSION_REVOKE = "permission.revoke"
+    PERMISSIONS_BULK_ASSIGN = "permission.bulk_assign"
 
     # Tenant management
     TENANT_CREATE = "tenant.create"
@@ -82,7 +231,7 @@ class AuditAction:
 
 
 # Resource types
-class ResourceType:
+class ResourceType(StrEnum):
     """Standard resource type constants."""
 
     USER = "user"
@@ -1,11 +1,12 @@
 """Authentication service."""
 
-import hashlib
+import functools
 from datetime import UTC, datetime, timedelta
+from typing import Any
+from uuid import UUID, uuid4
 
-from sqlalchemy import select
+from sqlalchemy import Row, insert, literal, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.core.config import settings
 from app.core.security import (
@@ -13,10 +14,44 @@ from app.core.security import (
     create_refresh_token,
     decode_token,
     hash_password,
+    hash_token,
     verify_password,
 )
-from app.models.user import RefreshToken, User, UserRole
+from app.models.user import RefreshToken, User
 from app.schemas.auth import LoginResponse, PhoneRegisterRequest, RegisterRequest, TokenResponse
+from app.services.rbac_service import user_role_names
+from app.services.totp_service import TOTPService
+
+
+@functools.cache
+def dummy_password_hash() -> str:
+    """A hash to verify against when no account matches.
+
+    Unknown identifiers then cost one bcrypt check like known ones, so
+    response times do not reveal which accounts exist. Computed once per
+    worker, at startup (see ``app.main.lifespan``), so no login pays for
+    building it.
+    """
+    return hash_password(uuid4().hex)
+
+
+def _access_token_claims(user: User | Row[Any], roles: list[str]) -> dict[str, Any]:
+    """Claims for a user's access token.
+
+    Besides the subject, the token carries the account flags, tenant and role
+    names, so a freshly issued token can authorize requests without a user
+    lookup (see ``app.api.deps.get_current_user``).
+    """
+    claims: dict[str, Any] = {
+        "sub": str(user.id),
+        "su": user.is_superuser,
+        "active": user.is_active,
+        "tid": str(user.tenant_id) if user.tenant_id else None,
+        "roles": roles,
+    }
+    if user.email:
+        claims["email"] = user.email
+    return claims
 
 
 class AuthService:
@@ -27,17 +62,16 @@ class AuthService:
 
     async def register(self, data: RegisterRequest) -> LoginResponse:
         """Register a new user."""
-        # Check if user exists
-        result = await self.db.execute(select(User).where(User.email == data.email))
-        if result.scalar_one_or_none():
-            raise ValueError("Email already registered")
-
+        # Check email and phone in one query; an email clash is reported first
+        taken = User.email == data.email
         if data.phone_number:
-            result = await self.db.execute(
-                select(User).where(User.phone_number == data.phone_number)
-            )
-            if result.scalar_one_or_none():
-                raise ValueError("Phone number already registered")
+            taken = or_(taken, User.phone_number == data.phone_number)
+        result = await self.db.execute(select(User.email).where(taken).limit(2))
+        existing_emails = result.scalars().all()
+        if data.email in existing_emails:
+            raise ValueError("Email already registered")
+        if existing_emails:
+            raise ValueError("Phone number already registered")
 
         # Create user
         user = User(
@@ -57,8 +91,10 @@ class AuthService:
     async def register_phone(self, data: PhoneRegisterRequest) -> LoginResponse:
         """Register a new user with phone number and PIN."""
         # Check if phone already exists
-        result = await self.db.execute(select(User).where(User.phone_number == data.phone_number))
-        if result.scalar_one_or_none():
+        result = await self.db.execute(
+            select(User.id).where(User.phone_number == data.phone_number).limit(1)
+        )
+        if result.first() is not None:
             raise ValueError("Phone number already registered")
 
         # Create user with phone as primary identifier, no email
@@ -85,14 +121,14 @@ class AuthService:
             dict with {"requires_2fa": True}: When 2FA is required but code not provided
             None: On invalid credentials
         """
-        result = await self.db.execute(
-            select(User)
-            .options(selectinload(User.roles).selectinload(UserRole.role))
-            .where(User.email == email)
-        )
-        user = result.scalar_one_or_none()
+        result = await self.db.execute(select(User, user_role_names()).where(User.email == email))
+        user, role_names = result.one_or_none() or (None, None)
+
+        if user is None:
+            verify_password(password, dummy_password_hash())
+            return None
 
-        if not user or not verify_password(password, user.hashed_password):
+        if not verify_password(password, user.hashed_password):
             return None
 
         if not user.is_active:
@@ -104,31 +140,27 @@ class AuthService:
                 # 2FA is enabled but no code provided
                 return {"requires_2fa": True}
 
-            # Verify TOTP code
-            from app.services.totp_service import TOTPService
-
-            totp_service = TOTPService(self.db)
-            if not await totp_service.verify_totp(user.id, totp_code):
+            # Verify TOTP code against the user already loaded above
+            if not TOTPService.verify_user_totp(user, totp_code):
                 return None  # Invalid TOTP code
 
         # Update last login
         user.last_login = datetime.now(UTC)
 
-        # Extract role names from loaded relationships
-        roles = [ur.role.name for ur in user.roles] if user.roles else []
-
-        return await self._create_tokens_response(user, roles)
+        return await self._create_tokens_response(user, role_names or [])
 
     async def login_phone(self, phone_number: str, pin: str) -> LoginResponse | None:
         """Authenticate user with phone number and PIN."""
         result = await self.db.execute(
-            select(User)
-            .options(selectinload(User.roles).selectinload(UserRole.role))
-            .where(User.phone_number == phone_number)
+            select(User, user_role_names()).where(User.phone_number == phone_number)
         )
-        user = result.scalar_one_or_none()
+        user, role_names = result.one_or_none() or (None, None)
+
+        if user is None:
+            verify_password(pin, dummy_password_hash())
+            return None
 
-        if not user or not verify_password(pin, user.hashed_password):
+        if not verify_password(pin, user.hashed_password):
             return None
 
         if not user.is_active:
@@ -137,43 +169,69 @@ class AuthService:
         # Update last login
         user.last_login = datetime.now(UTC)
 
-        roles = [ur.role.name for ur in user.roles] if user.roles else []
-        return await self._create_tokens_response(user, roles)
+        return await self._create_tokens_response(user, role_names or [])
 
     async def refresh_tokens(self, refresh_token: str) -> TokenResponse | None:
-        """Refresh access token using refresh token."""
+        """Refresh access token using refresh token.
+
+        Rotation is a single statement: a data-modifying CTE revokes the
+        presented token, inserts its replacement and returns the claims for
+        the new access token. A token that is unknown, revoked, expired or
+        belongs to an inactive user matches no row, and nothing is written.
+        """
         payload = decode_token(refresh_token)
         if not payload or payload.get("type") != "refresh":
             return None
+        try:
+            user_id = UUID(payload["sub"])
+        except (KeyError, TypeError, ValueError):
+            return None
 
-        token_hash = hashlib.sha256(refresh_token.encode()).hexdigest()
-        result = await self.db.execute(
-            select(RefreshToken)
-            .options(selectinload(RefreshToken.user))
+        now = datetime.now(UTC)
+        new_refresh_token = create_refresh_token({"sub": str(user_id)})
+
+        revoked = (
+            update(RefreshToken)
             .where(
-                RefreshToken.token_hash == token_hash,
+                RefreshToken.token_hash == hash_token(refresh_token),
+                RefreshToken.user_id == user_id,
                 RefreshToken.revoked_at.is_(None),
-                RefreshToken.expires_at > datetime.now(UTC),
+                RefreshToken.expires_at > now,
+                select(User.id).where(User.id == RefreshToken.user_id, User.is_active).exists(),
             )
+            .values(revoked_at=now)
+            .returning(RefreshToken.user_id)
+            .cte("revoked")
         )
-        stored_token = result.scalar_one_or_none()
-
-        if not stored_token or not stored_token.user.is_active:
+        inserted = (
+            insert(RefreshToken)
+            .from_select(
+                ["id", "user_id", "token_hash", "expires_at"],
+                select(
+                    literal(uuid4()),
+                    revoked.c.user_id,
+                    literal(hash_token(new_refresh_token)),
+                    literal(now + timedelta(days=settings.refresh_token_expire_days)),
+                ),
+            )
+            .returning(RefreshToken.user_id)
+            .cte("inserted")
+        )
+        result = await self.db.execute(
+            select(
+                User.id,
+                User.email,
+                User.is_active,
+                User.is_superuser,
+                User.tenant_id,
+                user_role_names().label("roles"),
+            ).join(inserted, inserted.c.user_id == User.id)
+        )
+        user = result.one_or_none()
+        if user is None:
             return None
 
-        # Revoke old refresh token
-        stored_token.revoked_at = datetime.now(UTC)
-
-        # Generate new tokens
-        user = stored_token.user
-        token_data = {"sub": str(user.id)}
-        if user.email:
-            token_data["email"] = user.email
-        access_token = create_access_token(token_data)
-        new_refresh_token = create_refresh_token({"sub": str(user.id)})
-
-        # Store new refresh token
-        await self._store_refresh_token(user.id, new_refresh_token)
+        access_token = create_access_token(_access_token_claims(user, user.roles or []))
 
         return TokenResponse(
             access_token=access_token,
@@ -182,31 +240,28 @@ class AuthService:
         )
 
     async def logout(self, refresh_token: str) -> None:
-        """Revoke refresh token."""
-        token_hash = hashlib.sha256(refresh_token.encode()).hexdigest()
-        result = await self.db.execute(
-            select(RefreshToken).where(RefreshToken.token_hash == token_hash)
+        """Revoke refresh token, in one UPDATE without loading the row."""
+        await self.db.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.token_hash == hash_token(refresh_token),
+                RefreshToken.revoked_at.is_(None),
+            )
+            .values(revoked_at=datetime.now(UTC))
         )
-        stored_token = result.scalar_one_or_none()
-        if stored_token:
-            stored_token.revoked_at = datetime.now(UTC)
 
     async def _create_tokens_response(
         self, user: User, roles: list[str] | None = None
     ) -> LoginResponse:
         """Create token response for user."""
-        token_data = {"sub": str(user.id)}
-        if user.email:
-            token_data["email"] = user.email
+        # Use provided roles or empty list for new users
+        user_roles = roles if roles is not None else []
 
-        access_token = create_access_token(token_data)
+        access_token = create_access_token(_access_token_claims(user, user_roles))
         refresh_token = create_refresh_token({"sub": str(user.id)})
 
         await self._store_refresh_token(user.id, refresh_token)
 
-        # Use provided roles or empty list for new users
-        user_roles = roles if roles is not None else []
-
         return LoginResponse(
             access_token=access_token,
             refresh_token=refresh_token,
@@ -222,7 +277,7 @@ class AuthService:
 
     async def _store_refresh_token(self, user_id, token: str) -> None:
         """Store refresh token hash in database."""
-        token_hash = hashlib.sha256(token.encode()).hexdigest()
+        token_hash = hash_token(token)
         expires_at = datetime.now(UTC) + timedelta(days=settings.refresh_token_expire_days)
 
         refresh_token = RefreshToken(
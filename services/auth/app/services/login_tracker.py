@@ -1,11 +1,69 @@
-"""Login attempt tracking service for security."""
-
+"""Login attempt tracking service for security.
+
+Lockout decisions are made from Redis failure counters, so a login request
+normally never waits on the database for them; only while Redis is down are
+failures counted from ``login_attempts``. Every attempt is still written to
+``login_attempts`` for the audit trail, but in batches through an AuditSink
+rather than one INSERT and commit per request.
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
+from typing import Any
 
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.redis import redis_client
 from app.models.user import LoginAttempt
+from app.services.audit_service import AuditSink
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class LoginAttemptEvent:
+    """A login attempt waiting to be written to ``login_attempts``."""
+
+    email: str
+    ip_address: str
+    success: bool
+    user_agent: str | None = None
+    failure_reason: str | None = None
+    attempted_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+
+    def to_row(self) -> dict[str, Any]:
+        """Return the column values for the login_attempts INSERT."""
+        return {
+            "email": self.email,
+            "ip_address": self.ip_address,
+            "success": self.success,
+            "user_agent": self.user_agent,
+            "failure_reason": self.failure_reason,
+            "attempted_at": self.attempted_at,
+        }
+
+
+login_attempt_sink = AuditSink(batch_size=256, model=LoginAttempt)
+
+
+def _digest(value: str) -> str:
+    """Hash an identifier for key names and logs, keeping PII out of both."""
+    return hashlib.sha256(value.encode()).hexdigest()[:32]
+
+
+def _email_key(email: str) -> str:
+    """Redis key counting recent failures for an account identifier."""
+    return f"login_fail:email:{_digest(email)}"
+
+
+def _ip_key(ip_address: str) -> str:
+    """Redis key counting recent failures from a client IP."""
+    return f"login_fail:ip:{_digest(ip_address)}"
 
 
 class LoginTracker:
@@ -14,8 +72,9 @@ class LoginTracker:
     MAX_ATTEMPTS = 5
     LOCKOUT_DURATION_MINUTES = 5
 
-    def __init__(self, db: AsyncSession) -> None:
+    def __init__(self, db: AsyncSession, redis: Redis | None = None) -> None:
         self.db = db
+        self.redis = redis or redis_client
 
     async def record_attempt(
         self,
@@ -24,72 +83,94 @@ class LoginTracker:
         success: bool,
         user_agent: str | None = None,
         failure_reason: str | None = None,
-    ) -> LoginAttempt:
-        """Record a login attempt."""
-        attempt = LoginAttempt(
-            email=email,
-            ip_address=ip_address,
-            success=success,
-            user_agent=user_agent,
-            failure_reason=failure_reason,
+    ) -> None:
+        """Record a login attempt.
+
+        Failures bump the lockout counters for the identifier and the IP;
+        each counter expires ``LOCKOUT_DURATION_MINUTES`` after its latest
+        failure. A success clears the identifier's counter. The attempt
+        itself is queued for a batched INSERT.
+        """
+        if success:
+            await self.clear_failed_attempts(email)
+        else:
+            window = self.LOCKOUT_DURATION_MINUTES * 60
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    pipe.incr(_email_key(email))
+                    pipe.expire(_email_key(email), window)
+                    pipe.incr(_ip_key(ip_address))
+                    pipe.expire(_ip_key(ip_address), window)
+                    await pipe.execute()
+            except RedisError:
+                logger.error(
+                    "Failed to count login failure for %s: Redis unavailable", _digest(email)
+                )
+
+        await login_attempt_sink.submit(
+            LoginAttemptEvent(
+                email=email,
+                ip_address=ip_address,
+                success=success,
+                user_agent=user_agent,
+                failure_reason=failure_reason,
+            )
         )
-        self.db.add(attempt)
-        await self.db.flush()
-        return attempt
 
     async def is_locked_out(self, email: str, ip_address: str) -> bool:
-        """Check if an account or IP is locked out due to too many failed attempts."""
-        cutoff = datetime.now(UTC) - timedelta(minutes=self.LOCKOUT_DURATION_MINUTES)
+        """Check if an account or IP is locked out due to too many failed attempts.
 
-        # Check failed attempts for this email
-        email_result = await self.db.execute(
-            select(func.count())
-            .select_from(LoginAttempt)
-            .where(
-                LoginAttempt.email == email,
-                LoginAttempt.success == False,  # noqa: E712
-                LoginAttempt.attempted_at > cutoff,
+        If Redis is unavailable, the account's failures are counted from
+        ``login_attempts`` instead; the per-IP limit is not applied then.
+        """
+        try:
+            email_failures, ip_failures = await self.redis.mget(
+                _email_key(email), _ip_key(ip_address)
             )
-        )
-        email_failures = email_result.scalar() or 0
+        except RedisError:
+            logger.warning("Login lockout checked against the database: Redis unavailable")
+            failures = await self.get_failed_attempts_count(
+                email, since_minutes=self.LOCKOUT_DURATION_MINUTES, limit=self.MAX_ATTEMPTS
+            )
+            return failures >= self.MAX_ATTEMPTS
 
-        if email_failures >= self.MAX_ATTEMPTS:
+        if int(email_failures or 0) >= self.MAX_ATTEMPTS:
             return True
 
-        # Check failed attempts for this IP
-        ip_result = await self.db.execute(
-            select(func.count())
-            .select_from(LoginAttempt)
-            .where(
-                LoginAttempt.ip_address == ip_address,
-                LoginAttempt.success == False,  # noqa: E712
-                LoginAttempt.attempted_at > cutoff,
-            )
-        )
-        ip_failures = ip_result.scalar() or 0
-
         # Allow more attempts from same IP since multiple users might share it
-        return ip_failures >= self.MAX_ATTEMPTS * 3
+        return int(ip_failures or 0) >= self.MAX_ATTEMPTS * 3
 
-    async def get_failed_attempts_count(self, email: str, since_minutes: int = 5) -> int:
-        """Get count of failed login attempts for an email."""
+    async def get_failed_attempts_count(
+        self, email: str, since_minutes: int = 5, limit: int | None = None
+    ) -> int:
+        """Get count of failed login attempts for an email from the audit trail.
+
+        With ``limit``, counting stops once that many failures are found, so
+        a threshold check does bounded work however long the history is.
+        """
         cutoff = datetime.now(UTC) - timedelta(minutes=since_minutes)
 
-        result = await self.db.execute(
-            select(func.count())
-            .select_from(LoginAttempt)
+        failures = (
+            select(LoginAttempt.id)
             .where(
                 LoginAttempt.email == email,
                 LoginAttempt.success == False,  # noqa: E712
                 LoginAttempt.attempted_at > cutoff,
             )
+            .limit(limit)
+            .subquery()
         )
+        result = await self.db.execute(select(func.count()).select_from(failures))
         return result.scalar() or 0
 
     async def clear_failed_attempts(self, email: str) -> None:
         """Clear failed attempt count after successful login.
 
-        Note: We don't actually delete records for audit purposes,
-        but the lockout check only looks at recent attempts.
+        Only the identifier's Redis counter is reset; the per-IP counter is
+        shared by everyone behind that address, and ``login_attempts`` rows
+        are kept for the audit trail.
         """
-        pass  # Records are kept for audit trail
+        try:
+            await self.redis.delete(_email_key(email))
+        except RedisError:
+            logger.error("Failed to clear login failures for %s: Redis unavailable", _digest(email))
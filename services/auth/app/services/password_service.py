@@ -1,6 +1,5 @@
 """Password reset and management service."""
 
-import hashlib
 import secrets
 from datetime import UTC, datetime, timedelta
 from uuid import UUID
@@ -8,7 +7,7 @@ from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import hash_password, verify_password
+from app.core.security import hash_password, hash_token, verify_password
 from app.models.user import PasswordResetToken, User
 
 
@@ -27,7 +26,7 @@ class PasswordService:
 
         # Generate secure token
         token = secrets.token_urlsafe(32)
-        token_hash = hashlib.sha256(token.encode()).hexdigest()
+        token_hash = hash_token(token)
 
         # Create reset token (valid for 1 hour)
         reset_token = PasswordResetToken(
@@ -41,7 +40,7 @@ class PasswordService:
 
     async def validate_reset_token(self, token: str) -> User | None:
         """Validate a password reset token and return the user."""
-        token_hash = hashlib.sha256(token.encode()).hexdigest()
+        token_hash = hash_token(token)
 
         result = await self.db.execute(
             select(PasswordResetToken).where(
@@ -60,7 +59,7 @@ class PasswordService:
 
     async def reset_password(self, token: str, new_password: str) -> bool:
         """Reset password using a valid reset token."""
-        token_hash = hashlib.sha256(token.encode()).hexdigest()
+        token_hash = hash_token(token)
 
         result = await self.db.execute(
             select(PasswordResetToken).where(
@@ -0,0 +1,116 @@
+"""Redis-backed cache of each user's effective permission codes.
+
+Each user also has a generation counter, bumped by every invalidation. A
+request that missed the cache reads the generation before loading grants
+from the database and only stores them if it is unchanged, so grants read
+before an admin's commit are never cached after the invalidation.
+"""
+
+import logging
+from collections.abc import Iterable
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, WatchError
+
+from app.core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+PERMISSION_CACHE_TTL_SECONDS = 300
+
+# Stored alongside the codes so users without permissions still cache as a hit
+_PRESENT = ""
+
+
+def _key(user_id: UUID) -> str:
+    """Cache key for a user; built from the id only so no PII ends up in Redis."""
+    return f"perms:{user_id}"
+
+
+def _generation_key(user_id: UUID) -> str:
+    """Key counting invalidations of a user's cached permissions."""
+    return f"perms_gen:{user_id}"
+
+
+class PermissionCache:
+    """Per-user permission code sets stored as ``perms:{user_id}``.
+
+    Lookups return ``None`` on a miss (or when Redis is unavailable) so the
+    caller falls back to the database and repopulates the entry.
+    """
+
+    def __init__(self, redis: Redis | None = None) -> None:
+        self.redis = redis or redis_client
+
+    async def check(self, user_id: UUID, codes: list[str]) -> list[bool] | None:
+        """Return membership of each code, or None on a cache miss."""
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.exists(_key(user_id))
+                pipe.smismember(_key(user_id), codes)
+                exists, members = await pipe.execute()
+        except RedisError:
+            logger.warning("Permission cache read skipped: Redis unavailable")
+            return None
+        if not exists:
+            return None
+        return [bool(m) for m in members]
+
+    async def generation(self, user_id: UUID) -> str | None:
+        """Return the user's cache generation; read it before loading grants.
+
+        Returns None both for a user never invalidated and when Redis is
+        unavailable; a write made with the latter is dropped by Redis anyway.
+        """
+        try:
+            return await self.redis.get(_generation_key(user_id))
+        except RedisError:
+            logger.warning("Permission cache generation read skipped: Redis unavailable")
+            return None
+
+    async def set_codes(self, user_id: UUID, codes: Iterable[str], generation: str | None) -> None:
+        """Store a user's permission codes with a TTL.
+
+        Skipped if the user's permissions were invalidated since
+        ``generation`` was read, since ``codes`` may then be stale.
+        """
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                await pipe.watch(_generation_key(user_id))
+                if await pipe.get(_generation_key(user_id)) != generation:
+                    return
+                pipe.multi()
+                pipe.delete(_key(user_id))
+                pipe.sadd(_key(user_id), _PRESENT, *codes)
+                pipe.expire(_key(user_id), PERMISSION_CACHE_TTL_SECONDS)
+                await pipe.execute()
+        except WatchError:
+            # Invalidated while writing; the next request reloads
+            pass
+        except RedisError:
+            logger.warning("Permission cache write skipped: Redis unavailable")
+
+    async def invalidate(self, user_ids: Iterable[UUID]) -> None:
+        """Drop cached permissions for the given users and bump their generations.
+
+        Call after the change is committed, so a request that loads grants
+        afterwards sees it. Generations outlive any entry written before
+        the bump.
+
+        Raises:
+            RedisError: If Redis is unavailable; cached grants may then stay
+                in effect for up to ``PERMISSION_CACHE_TTL_SECONDS``.
+        """
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                pipe.incr(_generation_key(user_id))
+                pipe.expire(_generation_key(user_id), PERMISSION_CACHE_TTL_SECONDS)
+            pipe.delete(*(_key(user_id) for user_id in user_ids))
+            await pipe.execute()
+
+
+permission_cache = PermissionCache()
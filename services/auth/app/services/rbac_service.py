@@ -1,19 +1,81 @@
 """Role-Based Access Control service."""
 
+from collections.abc import Collection, Sequence
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import (
+    ColumnElement,
+    RowMapping,
+    String,
+    any_,
+    bindparam,
+    delete,
+    exists,
+    func,
+    or_,
+    select,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload
+from sqlalchemy.sql.selectable import ScalarSelect
 
 from app.models.user import Permission, Role, RolePermission, User, UserRole
 
+# Columns returned by the role and permission list endpoints
+ROLE_LIST_COLUMNS = (
+    Role.id,
+    Role.name,
+    Role.description,
+    Role.tenant_id,
+    Role.is_system_role,
+    Role.created_at,
+)
+PERMISSION_LIST_COLUMNS = (
+    Permission.id,
+    Permission.code,
+    Permission.name,
+    Permission.description,
+    Permission.resource,
+    Permission.action,
+)
+
+
+def _code_in(codes: list[str]) -> ColumnElement[bool]:
+    """``permissions.code = ANY(:codes)`` with the codes bound as one array.
+
+    Unlike an expanding ``IN``, the SQL text does not depend on how many codes
+    are checked, so every call reuses the same prepared statement.
+    """
+    return Permission.code == any_(bindparam(None, codes, type_=ARRAY(String)))
+
+
+def user_role_names() -> ScalarSelect[Any]:
+    """Correlated subquery aggregating a user's role names (NULL when none).
+
+    Selected next to ``users`` columns, it loads role names in the same
+    statement as the user rows.
+    """
+    return (
+        select(func.array_agg(Role.name))
+        .join(UserRole, UserRole.role_id == Role.id)
+        .where(UserRole.user_id == User.id)
+        .scalar_subquery()
+    )
+
 
 class RBACService:
-    """Service for role and permission management."""
+    """Service for role and permission management.
+
+    Built per request, so it memoizes each user's permission codes for the
+    rest of the request; its own role and permission changes clear the memo.
+    """
 
     def __init__(self, db: AsyncSession) -> None:
         self.db = db
+        self._permission_codes: dict[UUID, frozenset[str]] = {}
 
     # Role operations
     async def create_role(
@@ -36,7 +98,9 @@ class RBACService:
 
     async def get_role(self, role_id: UUID) -> Role | None:
         """Get role by ID."""
-        result = await self.db.execute(select(Role).where(Role.id == role_id))
+        result = await self.db.execute(
+            select(Role).options(raiseload("*")).where(Role.id == role_id)
+        )
         return result.scalar_one_or_none()
 
     async def get_role_by_name(self, name: str) -> Role | None:
@@ -44,15 +108,15 @@ class RBACService:
         result = await self.db.execute(select(Role).where(Role.name == name))
         return result.scalar_one_or_none()
 
-    async def list_roles(self, tenant_id: UUID | None = None) -> list[Role]:
-        """List all roles, optionally filtered by tenant."""
-        query = select(Role)
+    async def list_roles(self, tenant_id: UUID | None = None) -> Sequence[RowMapping]:
+        """List all roles, optionally filtered by tenant, as ``ROLE_LIST_COLUMNS`` mappings."""
+        query = select(*ROLE_LIST_COLUMNS)
         if tenant_id:
             query = query.where(
                 (Role.tenant_id == tenant_id) | (Role.is_system_role == True)  # noqa: E712
             )
         result = await self.db.execute(query)
-        return list(result.scalars().all())
+        return result.mappings().all()
 
     async def delete_role(self, role_id: UUID) -> bool:
         """Delete a role."""
@@ -63,6 +127,7 @@ class RBACService:
         if role.is_system_role:
             raise ValueError("Cannot delete system role")
         await self.db.delete(role)
+        self._permission_codes.clear()
         return True
 
     # Permission operations
@@ -84,6 +149,8 @@ class RBACService:
         )
         self.db.add(permission)
         await self.db.flush()
+        # Superusers hold every permission, including this one
+        self._permission_codes.clear()
         return permission
 
     async def get_permission_by_code(self, code: str) -> Permission | None:
@@ -91,115 +158,180 @@ class RBACService:
         result = await self.db.execute(select(Permission).where(Permission.code == code))
         return result.scalar_one_or_none()
 
-    async def list_permissions(self) -> list[Permission]:
-        """List all permissions."""
-        result = await self.db.execute(select(Permission))
-        return list(result.scalars().all())
+    async def list_permissions(self) -> Sequence[RowMapping]:
+        """List all permissions as ``PERMISSION_LIST_COLUMNS`` mappings."""
+        result = await self.db.execute(select(*PERMISSION_LIST_COLUMNS))
+        return result.mappings().all()
 
     # Role-Permission operations
-    async def assign_permission_to_role(self, role_id: UUID, permission_id: UUID) -> RolePermission:
-        """Assign a permission to a role."""
-        role_permission = RolePermission(
-            role_id=role_id,
-            permission_id=permission_id,
+    async def assign_permission_to_role(self, role_id: UUID, permission_id: UUID) -> bool:
+        """Assign a permission to a role; returns False if it was already assigned."""
+        return await self.assign_permissions_to_role_bulk(role_id, [permission_id]) > 0
+
+    async def assign_permissions_to_role_bulk(
+        self, role_id: UUID, permission_ids: list[UUID]
+    ) -> int:
+        """Assign several permissions to a role with one multi-row INSERT.
+
+        Pairs that are already assigned are skipped. Returns the number of
+        newly assigned permissions.
+        """
+        rows = [{"role_id": role_id, "permission_id": pid} for pid in dict.fromkeys(permission_ids)]
+        result = await self.db.execute(
+            pg_insert(RolePermission)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["role_id", "permission_id"])
+            .returning(RolePermission.id)
         )
-        self.db.add(role_permission)
-        await self.db.flush()
-        return role_permission
+        self._permission_codes.clear()
+        return len(result.all())
 
     async def revoke_permission_from_role(self, role_id: UUID, permission_id: UUID) -> bool:
-        """Revoke a permission from a role."""
+        """Revoke a permission from a role with a single DELETE."""
         result = await self.db.execute(
-            select(RolePermission).where(
+            delete(RolePermission).where(
                 RolePermission.role_id == role_id,
                 RolePermission.permission_id == permission_id,
             )
         )
-        role_permission = result.scalar_one_or_none()
-        if not role_permission:
-            return False
-        await self.db.delete(role_permission)
-        return True
+        self._permission_codes.clear()
+        return result.rowcount > 0
 
-    async def get_role_permissions(self, role_id: UUID) -> list[Permission]:
+    async def get_role_permissions(self, role_id: UUID) -> Sequence[Permission]:
         """Get all permissions for a role."""
         result = await self.db.execute(
-            select(Permission).join(RolePermission).where(RolePermission.role_id == role_id)
+            select(Permission)
+            .join(RolePermission)
+            .options(raiseload("*"))
+            .where(RolePermission.role_id == role_id)
+        )
+        return result.scalars().all()
+
+    async def get_role_with_permissions(
+        self, role_id: UUID
+    ) -> tuple[Role, list[Permission]] | None:
+        """Get a role and its permissions in a single round-trip."""
+        result = await self.db.execute(
+            select(Role, Permission)
+            .outerjoin(RolePermission, RolePermission.role_id == Role.id)
+            .outerjoin(Permission, Permission.id == RolePermission.permission_id)
+            .options(raiseload("*"))
+            .where(Role.id == role_id)
         )
-        return list(result.scalars().all())
+        rows = result.all()
+        if not rows:
+            return None
+        return rows[0][0], [p for _, p in rows if p is not None]
 
     # User-Role operations
     async def assign_role_to_user(
         self, user_id: UUID, role_id: UUID, assigned_by: UUID | None = None
-    ) -> UserRole:
-        """Assign a role to a user."""
-        user_role = UserRole(
-            user_id=user_id,
-            role_id=role_id,
-            assigned_by=assigned_by,
+    ) -> bool:
+        """Assign a role to a user; returns False if it was already assigned."""
+        return await self.assign_roles_to_user_bulk(user_id, [role_id], assigned_by) > 0
+
+    async def assign_roles_to_user_bulk(
+        self, user_id: UUID, role_ids: list[UUID], assigned_by: UUID | None = None
+    ) -> int:
+        """Assign several roles to a user with one multi-row INSERT.
+
+        Roles the user already holds are skipped. Returns the number of
+        newly assigned roles.
+        """
+        rows = [
+            {"user_id": user_id, "role_id": rid, "assigned_by": assigned_by}
+            for rid in dict.fromkeys(role_ids)
+        ]
+        result = await self.db.execute(
+            pg_insert(UserRole)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["user_id", "role_id"])
+            .returning(UserRole.id)
         )
-        self.db.add(user_role)
-        await self.db.flush()
-        return user_role
+        self._permission_codes.pop(user_id, None)
+        return len(result.all())
 
     async def revoke_role_from_user(self, user_id: UUID, role_id: UUID) -> bool:
-        """Revoke a role from a user."""
+        """Revoke a role from a user with a single DELETE."""
         result = await self.db.execute(
-            select(UserRole).where(
+            delete(UserRole).where(
                 UserRole.user_id == user_id,
                 UserRole.role_id == role_id,
             )
         )
-        user_role = result.scalar_one_or_none()
-        if not user_role:
-            return False
-        await self.db.delete(user_role)
-        return True
+        self._permission_codes.pop(user_id, None)
+        return result.rowcount > 0
 
-    async def get_user_roles(self, user_id: UUID) -> list[Role]:
-        """Get all roles for a user."""
+    async def get_user_roles(self, user_id: UUID) -> Sequence[RowMapping]:
+        """Get all roles for a user, as ``ROLE_LIST_COLUMNS`` mappings."""
         result = await self.db.execute(
-            select(Role).join(UserRole).where(UserRole.user_id == user_id)
+            select(*ROLE_LIST_COLUMNS).join(UserRole).where(UserRole.user_id == user_id)
         )
-        return list(result.scalars().all())
+        return result.mappings().all()
 
     async def get_user_permissions(self, user_id: UUID) -> list[str]:
-        """Get all permission codes for a user."""
-        # Get user with roles and permissions
-        result = await self.db.execute(
-            select(User)
-            .options(selectinload(User.roles).selectinload(UserRole.role))
-            .where(User.id == user_id)
+        """Get all permission codes for a user, sorted."""
+        return sorted(await self.get_user_permission_codes(user_id))
+
+    @staticmethod
+    def _granted_to(user_id: UUID) -> ColumnElement[bool]:
+        """WHERE clause matching the permissions a user holds.
+
+        Superusers hold every permission; everyone else holds those granted
+        through their roles.
+        """
+        granted = (
+            select(RolePermission.permission_id)
+            .join(UserRole, UserRole.role_id == RolePermission.role_id)
+            .where(UserRole.user_id == user_id)
         )
-        user = result.scalar_one_or_none()
-        if not user:
-            return []
+        is_superuser = select(User.is_superuser).where(User.id == user_id).scalar_subquery()
+        return or_(is_superuser, Permission.id.in_(granted))
 
-        # Superuser has all permissions
-        if user.is_superuser:
-            perms_result = await self.db.execute(select(Permission.code))
-            return list(perms_result.scalars().all())
+    async def get_user_permission_codes(self, user_id: UUID) -> frozenset[str]:
+        """Get a user's effective permission codes with a single query.
 
-        # Collect permission codes from all roles
-        permission_codes = set()
-        for user_role in user.roles:
-            role_perms = await self.get_role_permissions(user_role.role_id)
-            for perm in role_perms:
-                permission_codes.add(perm.code)
+        Superusers get every permission code. Repeat calls for the same user
+        are answered from this instance's memo.
+        """
+        codes = self._permission_codes.get(user_id)
+        if codes is None:
+            result = await self.db.execute(select(Permission.code).where(self._granted_to(user_id)))
+            codes = self._permission_codes[user_id] = frozenset(result.scalars().all())
+        return codes
 
-        return list(permission_codes)
+    async def get_role_user_ids(self, role_id: UUID) -> Sequence[UUID]:
+        """Get the IDs of all users holding a role."""
+        result = await self.db.execute(
+            select(UserRole.user_id).where(UserRole.role_id == role_id).distinct()
+        )
+        return result.scalars().all()
 
     async def has_permission(self, user_id: UUID, permission_code: str) -> bool:
         """Check if user has a specific permission."""
-        permissions = await self.get_user_permissions(user_id)
-        return permission_code in permissions
+        return await self.has_any_permission(user_id, [permission_code])
 
-    async def has_any_permission(self, user_id: UUID, permission_codes: list[str]) -> bool:
+    async def has_any_permission(self, user_id: UUID, permission_codes: Collection[str]) -> bool:
         """Check if user has any of the specified permissions."""
-        permissions = await self.get_user_permissions(user_id)
-        return any(code in permissions for code in permission_codes)
+        if not permission_codes:
+            return False
+        codes = self._permission_codes.get(user_id)
+        if codes is not None:
+            return not codes.isdisjoint(permission_codes)
+        result = await self.db.execute(
+            select(exists().where(_code_in(list(permission_codes)), self._granted_to(user_id)))
+        )
+        return bool(result.scalar())
 
-    async def has_all_permissions(self, user_id: UUID, permission_codes: list[str]) -> bool:
+    async def has_all_permissions(self, user_id: UUID, permission_codes: Collection[str]) -> bool:
         """Check if user has all of the specified permissions."""
-        permissions = await self.get_user_permissions(user_id)
-        return all(code in permissions for code in permission_codes)
+        wanted = set(permission_codes)
+        if not wanted:
+            return True
+        codes = self._permission_codes.get(user_id)
+        if codes is not None:
+            return wanted.issubset(codes)
+        result = await self.db.execute(
+            select(func.count()).where(_code_in(list(wanted)), self._granted_to(user_id))
+        )
+        return result.scalar() == len(wanted)
@@ -0,0 +1,75 @@
+"""Access token revocation backed by Redis.
+
+Access tokens are validated without a database lookup, so revocation is
+tracked in Redis instead: ``revoked:{jti}`` marks a single token and
+``revoked_user:{user_id}`` holds a cutoff before which all of a user's
+tokens are issued at or before it. Both the cutoff and ``iat`` have
+sub-second precision, so a revocation also catches tokens issued earlier in
+the same second. Keys expire with the longest-lived access token.
+"""
+
+import logging
+import time
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+
+def _jti_key(jti: str) -> str:
+    """Redis key marking a single revoked token."""
+    return f"revoked:{jti}"
+
+
+def _user_key(user_id: UUID | str) -> str:
+    """Redis key holding a user's token revocation cutoff."""
+    return f"revoked_user:{user_id}"
+
+
+async def revoke_token(jti: str, expires_at: int) -> None:
+    """Revoke a single access token until it would have expired anyway."""
+    ttl = expires_at - int(time.time())
+    if ttl <= 0:
+        return
+    try:
+        await redis_client.set(_jti_key(jti), 1, ex=ttl)
+    except RedisError:
+        logger.error("Failed to revoke token %s: Redis unavailable", jti)
+
+
+async def revoke_user_tokens(user_id: UUID) -> None:
+    """Revoke every access token issued to a user up to now.
+
+    Used when a change invalidates the claims baked into existing tokens,
+    such as deactivation or a change of superuser status. Unlike the checks,
+    this does not fail open: callers must not report the change as applied
+    while the user's old tokens still carry their former rights.
+
+    Raises:
+        RedisError: If the cutoff could not be written.
+    """
+    await redis_client.set(
+        _user_key(user_id), time.time(), ex=settings.access_token_expire_minutes * 60
+    )
+
+
+async def is_token_revoked(jti: str | None, user_id: UUID, issued_at: float | None) -> bool:
+    """Check both revocation keys for a token in one round-trip.
+
+    Fails open if Redis is unavailable so that an outage does not lock every
+    user out; tokens are short-lived and still signature-checked.
+    """
+    try:
+        token_flag, user_cutoff = await redis_client.mget(_jti_key(jti or ""), _user_key(user_id))
+    except RedisError:
+        logger.warning("Token revocation check skipped: Redis unavailable")
+        return False
+    if token_flag is not None:
+        return True
+    # Tokens from before sub-second iat carry whole seconds, so one issued
+    # later in the cutoff's second is rejected too; it only costs a re-login
+    return user_cutoff is not None and (issued_at or 0) <= float(user_cutoff)
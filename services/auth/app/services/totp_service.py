@@ -1,23 +1,47 @@
 """Two-Factor Authentication service using TOTP."""
 
+import asyncio
 import base64
 from io import BytesIO
+from typing import Any
 from uuid import UUID
 
 import pyotp
 import qrcode
-from sqlalchemy import select
+from sqlalchemy import Row, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
 
 
+def _render_qr_code(provisioning_uri: str) -> str:
+    """Render a provisioning URI as a base64-encoded PNG QR code.
+
+    CPU-bound (~10ms); run it in a worker thread, off the event loop.
+    """
+    qr = qrcode.QRCode(version=1, box_size=10, border=5)
+    qr.add_data(provisioning_uri)
+    qr.make(fit=True)
+    img = qr.make_image(fill_color="black", back_color="white")
+
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
 class TOTPService:
     """Service for TOTP-based two-factor authentication."""
 
     def __init__(self, db: AsyncSession) -> None:
         self.db = db
 
+    async def _get_totp_fields(self, user_id: UUID) -> Row[Any] | None:
+        """Load only a user's ``totp_secret`` and ``totp_enabled``, for read-only checks."""
+        result = await self.db.execute(
+            select(User.totp_secret, User.totp_enabled).where(User.id == user_id)
+        )
+        return result.one_or_none()
+
     async def setup_totp(self, user_id: UUID) -> dict:
         """Generate TOTP secret and QR code for setup."""
         result = await self.db.execute(select(User).where(User.id == user_id))
@@ -37,15 +61,7 @@ class TOTPService:
         provisioning_uri = totp.provisioning_uri(name=user.email, issuer_name="AgriScheme Pro")
 
         # Generate QR code
-        qr = qrcode.QRCode(version=1, box_size=10, border=5)
-        qr.add_data(provisioning_uri)
-        qr.make(fit=True)
-        img = qr.make_image(fill_color="black", back_color="white")
-
-        # Convert to base64
-        buffer = BytesIO()
-        img.save(buffer, format="PNG")
-        qr_base64 = base64.b64encode(buffer.getvalue()).decode()
+        qr_base64 = await asyncio.to_thread(_render_qr_code, provisioning_uri)
 
         return {
             "secret": secret,
@@ -74,11 +90,15 @@ class TOTPService:
 
     async def verify_totp(self, user_id: UUID, code: str) -> bool:
         """Verify TOTP code for login."""
-        result = await self.db.execute(select(User).where(User.id == user_id))
-        user = result.scalar_one_or_none()
+        user = await self._get_totp_fields(user_id)
         if not user:
             return False
 
+        return self.verify_user_totp(user, code)
+
+    @staticmethod
+    def verify_user_totp(user: User | Row[Any], code: str) -> bool:
+        """Verify a TOTP code against an already loaded user or TOTP row; no I/O."""
         if not user.totp_enabled or not user.totp_secret:
             return False
 
@@ -104,6 +124,5 @@ class TOTPService:
 
     async def is_totp_enabled(self, user_id: UUID) -> bool:
         """Check if TOTP is enabled for user."""
-        result = await self.db.execute(select(User).where(User.id == user_id))
-        user = result.scalar_one_or_none()
+        user = await self._get_totp_fields(user_id)
         return user.totp_enabled if user else False
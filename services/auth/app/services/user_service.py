@@ -1,14 +1,68 @@
 """User management service."""
 
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import delete as sa_delete, func, select
+from sqlalchemy import Row, lambda_stmt, not_, select, tuple_, update
+from sqlalchemy import delete as sa_delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from app.core.security import hash_password
-from app.models.user import User
+from app.models.user import User, UserRole
 from app.schemas.user import UserListResponse, UserResponse, UserUpdate
+from app.services.rbac_service import user_role_names
+from app.utils.pagination import decode_cursor, encode_cursor
+
+# Columns returned by admin mutations, matching the admin UserResponse
+ADMIN_USER_COLUMNS = (
+    User.id,
+    User.email,
+    User.first_name,
+    User.last_name,
+    User.phone_number,
+    User.is_active,
+    User.is_superuser,
+    User.totp_enabled,
+    User.created_at,
+    User.last_login,
+)
+
+# Columns of the user UserResponse, selected as plain rows for listings
+USER_LIST_COLUMNS = (
+    User.id,
+    User.email,
+    User.first_name,
+    User.last_name,
+    User.phone_number,
+    User.national_id,
+    User.is_active,
+    User.is_verified,
+    User.created_at,
+    User.last_login,
+)
+
+
+# Loads roles with their Role rows so ``ur.role.name`` never lazy-loads
+_WITH_ROLES = selectinload(User.roles).joinedload(UserRole.role)
+
+
+# Hot lookups are built as lambda statements: SQLAlchemy keys its compiled
+# cache on the lambda's code, so repeat calls skip statement construction.
+def _user_by_id(user_id: UUID) -> StatementLambdaElement:
+    """SELECT one user by ID, without roles."""
+    return lambda_stmt(lambda: select(User).where(User.id == user_id))
+
+
+def _user_with_roles_by_id(user_id: UUID) -> StatementLambdaElement:
+    """SELECT one user, with roles, by ID."""
+    return lambda_stmt(lambda: select(User).options(_WITH_ROLES).where(User.id == user_id))
+
+
+def _user_by_email(email: str) -> StatementLambdaElement:
+    """SELECT one user by email, without roles."""
+    return lambda_stmt(lambda: select(User).where(User.email == email))
 
 
 class UserService:
@@ -18,24 +72,23 @@ class UserService:
         self.db = db
 
     async def get_user(self, user_id: UUID) -> User | None:
-        """Get user by ID."""
-        result = await self.db.execute(
-            select(User).options(selectinload(User.roles)).where(User.id == user_id)
-        )
+        """Get user by ID, without roles; use ``get_user_with_roles`` to read them."""
+        result = await self.db.execute(_user_by_id(user_id))
+        return result.scalar_one_or_none()
+
+    async def get_user_with_roles(self, user_id: UUID) -> User | None:
+        """Get user by ID with roles loaded, for responses that list them."""
+        result = await self.db.execute(_user_with_roles_by_id(user_id))
         return result.scalar_one_or_none()
 
     async def get_user_by_email(self, email: str) -> User | None:
-        """Get user by email."""
-        result = await self.db.execute(
-            select(User).options(selectinload(User.roles)).where(User.email == email)
-        )
+        """Get user by email, without roles."""
+        result = await self.db.execute(_user_by_email(email))
         return result.scalar_one_or_none()
 
     async def update_user(self, user_id: UUID, data: UserUpdate) -> User:
-        """Update user profile."""
-        result = await self.db.execute(
-            select(User).options(selectinload(User.roles)).where(User.id == user_id)
-        )
+        """Update user profile; the returned user has roles loaded."""
+        result = await self.db.execute(_user_with_roles_by_id(user_id))
         user = result.scalar_one_or_none()
         if not user:
             raise ValueError("User not found")
@@ -48,27 +101,36 @@ class UserService:
 
     async def list_users(
         self,
-        page: int = 1,
+        cursor: str | None = None,
         page_size: int = 20,
         tenant_id: UUID | None = None,
     ) -> UserListResponse:
-        """List users with pagination."""
-        query = select(User).options(selectinload(User.roles))
+        """List users newest first, one keyset page at a time.
 
-        if tenant_id:
-            query = query.where(User.tenant_id == tenant_id)
+        Raises:
+            ValueError: If ``cursor`` is malformed.
+        """
+        # Only the response columns and role names, as rows of one statement:
+        # no hashes or secrets decoded and no ORM instances built for a
+        # read-only page
+        query = lambda_stmt(lambda: select(*USER_LIST_COLUMNS, user_role_names().label("roles")))
 
-        # Count total
-        count_query = select(func.count()).select_from(User)
         if tenant_id:
-            count_query = count_query.where(User.tenant_id == tenant_id)
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar() or 0
+            query += lambda q: q.where(User.tenant_id == tenant_id)
+
+        if cursor:
+            cursor_ts, cursor_id = decode_cursor(cursor)
+            query += lambda q: q.where(
+                tuple_(User.created_at, User.id) < tuple_(cursor_ts, cursor_id)
+            )
 
-        # Get page
-        query = query.offset((page - 1) * page_size).limit(page_size)
+        # Fetch one extra row to learn whether another page follows
+        fetch = page_size + 1
+        query += lambda q: q.order_by(User.created_at.desc(), User.id.desc()).limit(fetch)
         result = await self.db.execute(query)
-        users = result.scalars().all()
+        users = result.all()
+        has_next = len(users) > page_size
+        users = users[:page_size]
 
         items = [
             UserResponse(
@@ -80,7 +142,7 @@ class UserService:
                 national_id=user.national_id,
                 is_active=user.is_active,
                 is_verified=user.is_verified,
-                roles=[ur.role.name for ur in user.roles],
+                roles=user.roles or [],
                 created_at=user.created_at,
                 last_login=user.last_login,
             )
@@ -89,10 +151,9 @@ class UserService:
 
         return UserListResponse(
             items=items,
-            total=total,
-            page=page,
             page_size=page_size,
-            pages=(total + page_size - 1) // page_size,
+            next_cursor=encode_cursor(users[-1].created_at, users[-1].id) if has_next else None,
+            has_next=has_next,
         )
 
     async def create_user(
@@ -110,9 +171,7 @@ class UserService:
             raise ValueError("Email already registered")
 
         if phone_number:
-            result = await self.db.execute(
-                select(User).where(User.phone_number == phone_number)
-            )
+            result = await self.db.execute(select(User).where(User.phone_number == phone_number))
             if result.scalar_one_or_none():
                 raise ValueError("Phone number already registered")
 
@@ -128,26 +187,47 @@ class UserService:
         await self.db.flush()
         return user
 
-    async def activate_user(self, user_id: UUID) -> User:
-        """Activate user account."""
-        user = await self.get_user(user_id)
-        if not user:
+    async def update_user_fields(self, user_id: UUID, values: dict[str, Any]) -> Row:
+        """Update user columns with a single UPDATE ... RETURNING.
+
+        Returns the ``ADMIN_USER_COLUMNS`` of the updated row.
+        """
+        if values:
+            stmt = (
+                update(User)
+                .where(User.id == user_id)
+                .values(**values)
+                .returning(*ADMIN_USER_COLUMNS)
+            )
+        else:
+            stmt = select(*ADMIN_USER_COLUMNS).where(User.id == user_id)
+        row = (await self.db.execute(stmt)).one_or_none()
+        if not row:
             raise ValueError("User not found")
-        user.is_active = True
-        return user
+        return row
+
+    async def activate_user(self, user_id: UUID) -> Row:
+        """Activate user account."""
+        return await self.update_user_fields(user_id, {"is_active": True})
 
-    async def deactivate_user(self, user_id: UUID) -> User:
+    async def deactivate_user(self, user_id: UUID) -> Row:
         """Deactivate user account."""
-        user = await self.get_user(user_id)
-        if not user:
-            raise ValueError("User not found")
-        user.is_active = False
-        return user
+        return await self.update_user_fields(user_id, {"is_active": False})
 
-    async def delete_user(self, user_id: UUID) -> None:
-        """Permanently delete a user."""
-        user = await self.get_user(user_id)
-        if not user:
+    async def toggle_user_active(self, user_id: UUID) -> Row:
+        """Flip the user's active flag in place and return the updated row."""
+        return await self.update_user_fields(user_id, {"is_active": not_(User.is_active)})
+
+    async def delete_user(self, user_id: UUID) -> str | None:
+        """Permanently delete a user with a single DELETE; returns their email.
+
+        Raises:
+            ValueError: If the user does not exist.
+        """
+        result = await self.db.execute(
+            sa_delete(User).where(User.id == user_id).returning(User.email)
+        )
+        row = result.one_or_none()
+        if row is None:
             raise ValueError("User not found")
-        await self.db.execute(sa_delete(User).where(User.id == user_id))
-        await self.db.flush()
+        return row.email
@@ -0,0 +1,25 @@
+"""Keyset (cursor) pagination helpers."""
+
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+
+def encode_cursor(created_at: datetime, item_id: UUID) -> str:
+    """Encode a ``(created_at, id)`` sort key into an opaque cursor."""
+    raw = json.dumps([created_at.isoformat(), str(item_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode an opaque cursor back into its ``(created_at, id)`` sort key.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        ts_iso, id_str = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(ts_iso), UUID(id_str)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid pagination cursor") from e
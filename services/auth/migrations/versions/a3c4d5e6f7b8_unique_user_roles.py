@@ -0,0 +1,36 @@
+"""unique_user_roles
+
+Revision ID: a3c4d5e6f7b8
+Revises: f2b3c4d5e6a7
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c4d5e6f7b8'
+down_revision: Union[str, Sequence[str], None] = 'f2b3c4d5e6a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Deduplicate user_roles and enforce one row per pair."""
+    op.execute(sa.text(
+        'DELETE FROM user_roles a USING user_roles b '
+        'WHERE a.user_id = b.user_id AND a.role_id = b.role_id '
+        'AND a.ctid > b.ctid'
+    ))
+    op.create_unique_constraint(
+        'uq_user_roles_user_role',
+        'user_roles',
+        ['user_id', 'role_id'],
+    )
+
+
+def downgrade() -> None:
+    """Drop the user/role uniqueness constraint."""
+    op.drop_constraint('uq_user_roles_user_role', 'user_roles', type_='unique')
@@ -0,0 +1,66 @@
+"""tenant_composite_indexes
+
+Revision ID: c5e6f7a8b9d0
+Revises: a3c4d5e6f7b8
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e6f7a8b9d0'
+down_revision: Union[str, Sequence[str], None] = 'a3c4d5e6f7b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Replace single-column tenant_id indexes with tenant-leading composites.
+
+    Built and dropped concurrently, outside the migration transaction, so
+    users and roles stay writable.
+    """
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_tenant_email',
+            'users',
+            ['tenant_id', 'email'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_users_tenant_active',
+            'users',
+            ['tenant_id'],
+            unique=False,
+            postgresql_where=sa.text('is_active'),
+            postgresql_concurrently=True,
+        )
+        op.drop_index('ix_users_tenant_id', table_name='users', postgresql_concurrently=True)
+
+        op.create_index(
+            'ix_roles_tenant_name',
+            'roles',
+            ['tenant_id', 'name'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index('ix_roles_tenant_id', table_name='roles', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Restore the single-column tenant_id indexes."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_roles_tenant_id', 'roles', ['tenant_id'], unique=False, postgresql_concurrently=True
+        )
+        op.drop_index('ix_roles_tenant_name', table_name='roles', postgresql_concurrently=True)
+
+        op.create_index(
+            'ix_users_tenant_id', 'users', ['tenant_id'], unique=False, postgresql_concurrently=True
+        )
+        op.drop_index('ix_users_tenant_active', table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix_users_tenant_email', table_name='users', postgresql_concurrently=True)
@@ -0,0 +1,45 @@
+"""binary_token_hashes
+
+Revision ID: d6f7a8b9c0e1
+Revises: c5e6f7a8b9d0
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6f7a8b9c0e1'
+down_revision: Union[str, Sequence[str], None] = 'c5e6f7a8b9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TOKEN_TABLES = ('refresh_tokens', 'password_reset_tokens')
+
+
+def upgrade() -> None:
+    """Store token hashes as raw SHA-256 digests instead of hex text."""
+    for table in TOKEN_TABLES:
+        op.alter_column(
+            table,
+            'token_hash',
+            type_=sa.LargeBinary(length=32),
+            existing_type=sa.String(length=255),
+            existing_nullable=False,
+            postgresql_using="decode(token_hash, 'hex')",
+        )
+
+
+def downgrade() -> None:
+    """Store token hashes as hex text again."""
+    for table in TOKEN_TABLES:
+        op.alter_column(
+            table,
+            'token_hash',
+            type_=sa.String(length=255),
+            existing_type=sa.LargeBinary(length=32),
+            existing_nullable=False,
+            postgresql_using="encode(token_hash, 'hex')",
+        )
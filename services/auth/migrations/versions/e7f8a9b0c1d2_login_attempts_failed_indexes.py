@@ -0,0 +1,59 @@
+"""login_attempts_failed_indexes
+
+Revision ID: e7f8a9b0c1d2
+Revises: d6f7a8b9c0e1
+Create Date: 2026-10-16 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7f8a9b0c1d2'
+down_revision: Union[str, Sequence[str], None] = 'd6f7a8b9c0e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FAILED_ONLY = sa.text('NOT success')
+
+
+def upgrade() -> None:
+    """Add partial indexes over failed login attempts, per email and per IP.
+
+    login_attempts takes a row for every login, so the indexes are built
+    concurrently, outside the migration transaction, to keep it writable.
+    """
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_login_attempts_failed_email',
+            'login_attempts',
+            ['email', sa.text('attempted_at DESC')],
+            unique=False,
+            postgresql_where=FAILED_ONLY,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_login_attempts_failed_ip',
+            'login_attempts',
+            ['ip_address', sa.text('attempted_at DESC')],
+            unique=False,
+            postgresql_where=FAILED_ONLY,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Drop the failed login attempt indexes."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_login_attempts_failed_ip',
+            table_name='login_attempts',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_login_attempts_failed_email',
+            table_name='login_attempts',
+            postgresql_concurrently=True,
+        )
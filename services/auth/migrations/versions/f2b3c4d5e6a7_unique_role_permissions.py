@@ -0,0 +1,36 @@
+"""unique_role_permissions
+
+Revision ID: f2b3c4d5e6a7
+Revises: e1a2b3c4d5f6
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b3c4d5e6a7'
+down_revision: Union[str, Sequence[str], None] = 'e1a2b3c4d5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Deduplicate role_permissions and enforce one row per pair."""
+    op.execute(sa.text(
+        'DELETE FROM role_permissions a USING role_permissions b '
+        'WHERE a.role_id = b.role_id AND a.permission_id = b.permission_id '
+        'AND a.ctid > b.ctid'
+    ))
+    op.create_unique_constraint(
+        'uq_role_permissions_role_permission',
+        'role_permissions',
+        ['role_id', 'permission_id'],
+    )
+
+
+def downgrade() -> None:
+    """Drop the role/permission uniqueness constraint."""
+    op.drop_constraint('uq_role_permissions_role_permission', 'role_permissions', type_='unique')
@@ -0,0 +1,40 @@
+"""user_roles_role_index
+
+Revision ID: f8a9b0c1d2e3
+Revises: e7f8a9b0c1d2
+Create Date: 2026-10-16 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f8a9b0c1d2e3'
+down_revision: Union[str, Sequence[str], None] = 'e7f8a9b0c1d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index user_roles by role, for role holder lookups and cascades.
+
+    Built concurrently, outside the migration transaction, so role
+    assignments keep working meanwhile.
+    """
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_user_roles_role_user',
+            'user_roles',
+            ['role_id', 'user_id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Drop the user_roles role index."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_user_roles_role_user', table_name='user_roles', postgresql_concurrently=True
+        )
@@ -0,0 +1,100 @@
+"""Tests for AuthService token issuing and rotation."""
+
+import pytest
+import pytest_asyncio
+
+from app.core.security import decode_token, hash_password
+from app.models.user import Role, User, UserRole
+from app.services.auth_service import AuthService
+
+
+@pytest_asyncio.fixture
+async def user(db_session):
+    user = User(
+        email="farmer@example.com",
+        hashed_password=hash_password("Passw0rd!x"),
+        first_name="Amina",
+        last_name="Otieno",
+    )
+    role = Role(name="farmer")
+    db_session.add_all([user, role])
+    await db_session.flush()
+    db_session.add(UserRole(user_id=user.id, role_id=role.id))
+    await db_session.flush()
+    return user
+
+
+class TestLogin:
+    """Tests for password login."""
+
+    async def test_login_issues_tokens_with_roles(self, db_session, user):
+        """A correct password yields tokens whose claims carry the roles."""
+        result = await AuthService(db_session).login("farmer@example.com", "Passw0rd!x")
+
+        claims = decode_token(result.access_token)
+        assert claims["sub"] == str(user.id)
+        assert claims["roles"] == ["farmer"]
+        assert claims["active"] is True
+
+    async def test_wrong_password_and_unknown_email(self, db_session, user):
+        """Both failures look the same to the caller."""
+        service = AuthService(db_session)
+
+        assert await service.login("farmer@example.com", "wrong") is None
+        assert await service.login("nobody@example.com", "Passw0rd!x") is None
+
+
+class TestRefreshTokens:
+    """Tests for refresh token rotation."""
+
+    async def test_rotation_issues_new_tokens(self, db_session, user):
+        """A valid refresh token is exchanged for a new pair."""
+        service = AuthService(db_session)
+        login = await service.login("farmer@example.com", "Passw0rd!x")
+
+        refreshed = await service.refresh_tokens(login.refresh_token)
+
+        assert refreshed is not None
+        assert refreshed.refresh_token != login.refresh_token
+        claims = decode_token(refreshed.access_token)
+        assert claims["sub"] == str(user.id)
+        assert claims["roles"] == ["farmer"]
+
+    async def test_rotated_token_cannot_be_reused(self, db_session, user):
+        """Rotation revokes the presented token; only its successor works."""
+        service = AuthService(db_session)
+        login = await service.login("farmer@example.com", "Passw0rd!x")
+        refreshed = await service.refresh_tokens(login.refresh_token)
+
+        assert await service.refresh_tokens(login.refresh_token) is None
+        assert await service.refresh_tokens(refreshed.refresh_token) is not None
+
+    async def test_logged_out_token_is_rejected(self, db_session, user):
+        """Logout revokes the refresh token."""
+        service = AuthService(db_session)
+        login = await service.login("farmer@example.com", "Passw0rd!x")
+
+        await service.logout(login.refresh_token)
+
+        assert await service.refresh_tokens(login.refresh_token) is None
+
+    async def test_inactive_user_cannot_refresh(self, db_session, user):
+        """Deactivated accounts get no new tokens."""
+        service = AuthService(db_session)
+        login = await service.login("farmer@example.com", "Passw0rd!x")
+        user.is_active = False
+        await db_session.flush()
+
+        assert await service.refresh_tokens(login.refresh_token) is None
+
+    @pytest.mark.parametrize("token", ["", "not-a-jwt"])
+    async def test_invalid_token(self, db_session, token):
+        """Tokens that do not decode are rejected without a query."""
+        assert await AuthService(db_session).refresh_tokens(token) is None
+
+    async def test_access_token_cannot_refresh(self, db_session, user):
+        """Only refresh tokens can be rotated."""
+        service = AuthService(db_session)
+        login = await service.login("farmer@example.com", "Passw0rd!x")
+
+        assert await service.refresh_tokens(login.access_token) is None
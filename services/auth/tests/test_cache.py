@@ -0,0 +1,75 @@
+"""Tests for the in-process TTL cache."""
+
+import pytest
+
+from app.utils import cache
+from app.utils.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A controllable monotonic clock for the cache module."""
+    now = [1_000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+class TestTTLCache:
+    """Tests for expiry and LRU eviction."""
+
+    def test_get_returns_value_until_expiry(self, clock):
+        """Entries are served for ``ttl`` seconds, then dropped."""
+        c: TTLCache[str, int] = TTLCache(maxsize=10, ttl=30)
+        c.set("a", 1)
+
+        clock[0] += 29.9
+        assert c.get("a") == 1
+
+        clock[0] += 0.1
+        assert c.get("a") is None
+        assert len(c) == 0
+
+    def test_per_entry_ttl_is_capped(self, clock):
+        """A per-entry TTL can shorten but never extend the cache TTL."""
+        c: TTLCache[str, int] = TTLCache(maxsize=10, ttl=30)
+        c.set("short", 1, ttl=5)
+        c.set("long", 2, ttl=60)
+
+        clock[0] += 5
+        assert c.get("short") is None
+        clock[0] += 25
+        assert c.get("long") is None
+
+    def test_non_positive_ttl_is_not_stored(self, clock):
+        """Values that are already stale are never cached."""
+        c: TTLCache[str, int] = TTLCache(maxsize=10, ttl=30)
+        c.set("a", 1, ttl=0)
+
+        assert c.get("a") is None
+
+    def test_evicts_least_recently_used(self, clock):
+        """Beyond ``maxsize`` the least recently used entry goes first."""
+        c: TTLCache[str, int] = TTLCache(maxsize=2, ttl=30)
+        c.set("a", 1)
+        c.set("b", 2)
+        assert c.get("a") == 1  # "b" is now least recently used
+
+        c.set("c", 3)
+
+        assert c.get("b") is None
+        assert c.get("a") == 1
+        assert c.get("c") == 3
+
+    def test_pop_and_clear(self, clock):
+        """Entries can be dropped individually or all at once."""
+        c: TTLCache[str, int] = TTLCache(maxsize=10, ttl=30)
+        c.set("a", 1)
+        c.set("b", 2)
+
+        c.pop("a")
+        c.pop("missing")
+        assert c.get("a") is None
+        assert c.get("b") == 2
+
+        c.clear()
+        assert len(c) == 0
@@ -0,0 +1,85 @@
+"""Tests for token claims and permission checks in API dependencies."""
+
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.api.deps import TokenClaims, _claims_from_token, require_permission
+from app.core.security import create_access_token
+
+
+def _credentials(claims: dict) -> HTTPAuthorizationCredentials:
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token(claims))
+
+
+class TestClaimsFromToken:
+    """Tests for reading account state from access tokens."""
+
+    def test_reads_account_flags(self):
+        """Current tokens carry the account flags and roles."""
+        user_id = uuid.uuid4()
+        claims = _claims_from_token(
+            _credentials({"sub": str(user_id), "su": True, "active": True, "roles": ["admin"]})
+        )
+
+        assert claims.user_id == user_id
+        assert claims.is_superuser
+        assert claims.is_active
+        assert claims.roles == ("admin",)
+
+    @pytest.mark.parametrize("missing", ["su", "active"])
+    def test_token_without_account_flags_is_rejected(self, missing):
+        """Tokens issued before the flags were added cannot vouch for the account."""
+        claims = {"sub": str(uuid.uuid4()), "su": False, "active": True}
+        del claims[missing]
+
+        with pytest.raises(HTTPException) as exc_info:
+            _claims_from_token(_credentials(claims))
+        assert exc_info.value.status_code == 401
+
+
+class StubRBAC:
+    """Resolves permission codes from a fixed grant set."""
+
+    def __init__(self, granted: frozenset[str]) -> None:
+        self.granted = granted
+
+    async def get_user_permission_codes(self, user_id: uuid.UUID) -> frozenset[str]:
+        return self.granted
+
+
+def _request() -> SimpleNamespace:
+    """A request whose token was already validated by another dependency."""
+    claims = TokenClaims(
+        user_id=uuid.uuid4(),
+        is_superuser=False,
+        is_active=True,
+        jti=None,
+        issued_at=None,
+        expires_at=None,
+    )
+    return SimpleNamespace(state=SimpleNamespace(claims=claims))
+
+
+class TestRequirePermission:
+    """Tests for permission-guarded routes."""
+
+    async def test_grants_holder(self, fake_redis):
+        """Users holding the code get their claims back."""
+        request = _request()
+        checker = require_permission("users:read")
+
+        claims = await checker(request, None, StubRBAC(frozenset({"users:read"})))
+
+        assert claims is request.state.claims
+
+    async def test_rejects_missing_permission(self, fake_redis):
+        """Users without the code are forbidden."""
+        checker = require_permission("users:read")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await checker(_request(), None, StubRBAC(frozenset({"users:write"})))
+        assert exc_info.value.status_code == 403
@@ -0,0 +1,109 @@
+"""Tests for login attempt tracking and lockout."""
+
+import pytest
+
+from app.models.user import LoginAttempt
+from app.services import login_tracker as login_tracker_module
+from app.services.audit_service import AuditSink
+from app.services.login_tracker import LoginTracker
+from tests.conftest import UnavailableRedis
+
+EMAIL = "farmer@example.com"
+IP = "203.0.113.7"
+
+
+@pytest.fixture(autouse=True)
+def sink(monkeypatch):
+    """Collect queued login attempts in a sink no writer drains."""
+    sink = AuditSink(model=LoginAttempt)
+    monkeypatch.setattr(login_tracker_module, "login_attempt_sink", sink)
+    return sink
+
+
+@pytest.fixture
+def tracker(fake_redis):
+    return LoginTracker(db=None, redis=fake_redis)
+
+
+async def _fail(tracker: LoginTracker, times: int, email: str = EMAIL, ip: str = IP) -> None:
+    for _ in range(times):
+        await tracker.record_attempt(email, ip, success=False, failure_reason="invalid_password")
+
+
+class TestLockout:
+    """Tests for Redis-counted lockouts."""
+
+    async def test_locked_out_after_max_attempts(self, tracker):
+        """The account locks on its MAX_ATTEMPTS-th failure."""
+        await _fail(tracker, LoginTracker.MAX_ATTEMPTS - 1)
+        assert not await tracker.is_locked_out(EMAIL, IP)
+
+        await _fail(tracker, 1)
+        assert await tracker.is_locked_out(EMAIL, IP)
+
+    async def test_success_clears_account_counter(self, tracker):
+        """A successful login resets the account's failures."""
+        await _fail(tracker, LoginTracker.MAX_ATTEMPTS - 1)
+        await tracker.record_attempt(EMAIL, IP, success=True)
+        await _fail(tracker, LoginTracker.MAX_ATTEMPTS - 1)
+
+        assert not await tracker.is_locked_out(EMAIL, IP)
+
+    async def test_shared_ip_allows_more_attempts(self, tracker):
+        """An IP locks out only after three times the per-account limit."""
+        for i in range(LoginTracker.MAX_ATTEMPTS * 3 - 1):
+            await _fail(tracker, 1, email=f"user{i}@example.com")
+        assert not await tracker.is_locked_out("new@example.com", IP)
+
+        await _fail(tracker, 1, email="last@example.com")
+        assert await tracker.is_locked_out("new@example.com", IP)
+
+    async def test_counters_keep_identifiers_out_of_redis(self, tracker, fake_redis):
+        """Keys carry digests, never the raw email or IP."""
+        await _fail(tracker, 1)
+
+        keys = " ".join(fake_redis.data)
+        assert EMAIL not in keys
+        assert IP not in keys
+
+    async def test_attempts_are_queued_for_audit(self, tracker, sink):
+        """Every attempt is queued for the login_attempts table."""
+        await _fail(tracker, 2)
+        await tracker.record_attempt(EMAIL, IP, success=True)
+
+        assert sink._queue.qsize() == 3
+
+
+class TestRedisDown:
+    """Tests for lockout decisions while Redis is unavailable."""
+
+    async def test_falls_back_to_login_attempts(self, db_session):
+        """Failures recorded in the database still lock the account."""
+        db_session.add_all(
+            LoginAttempt(email=EMAIL, ip_address=IP, success=False)
+            for _ in range(LoginTracker.MAX_ATTEMPTS)
+        )
+        await db_session.flush()
+        tracker = LoginTracker(db_session, redis=UnavailableRedis())
+
+        assert await tracker.is_locked_out(EMAIL, IP)
+        assert not await tracker.is_locked_out("other@example.com", IP)
+
+    async def test_logs_omit_identifiers(self, caplog):
+        """Failures to update the counters are logged without the email."""
+        tracker = LoginTracker(db=None, redis=UnavailableRedis())
+
+        await tracker.record_attempt(EMAIL, IP, success=False)
+        await tracker.record_attempt(EMAIL, IP, success=True)
+
+        assert "Redis unavailable" in caplog.text
+        assert EMAIL not in caplog.text
+
+    async def test_recording_survives_outage(self, db_session, sink):
+        """Attempts are still queued for audit when the counters fail."""
+        tracker = LoginTracker(db_session, redis=UnavailableRedis())
+
+        await tracker.record_attempt(EMAIL, IP, success=False)
+        await tracker.record_attempt(EMAIL, IP, success=True)
+
+        assert sink._queue.qsize() == 2
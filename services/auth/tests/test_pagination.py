@@ -0,0 +1,42 @@
+"""Tests for keyset pagination cursors."""
+
+import base64
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def _b64(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+class TestCursor:
+    """Tests for encoding and decoding cursors."""
+
+    def test_round_trip(self):
+        """A cursor decodes back to its sort key."""
+        created_at = datetime(2026, 1, 2, 3, 4, 5, 678_000, tzinfo=UTC)
+        item_id = uuid.uuid4()
+
+        assert decode_cursor(encode_cursor(created_at, item_id)) == (created_at, item_id)
+
+    @pytest.mark.parametrize(
+        "cursor",
+        [
+            "",
+            "not base64!",
+            _b64(b"not json"),
+            _b64(b'{"a": 1}'),
+            _b64(b'["2026-01-02T03:04:05"]'),
+            _b64(b'["yesterday", "00000000-0000-0000-0000-000000000000"]'),
+            _b64(b'["2026-01-02T03:04:05", "not-a-uuid"]'),
+            _b64(b"[1, 2]"),
+        ],
+    )
+    def test_malformed_cursor_raises_value_error(self, cursor):
+        """Anything but an encoded sort key is rejected as a ValueError."""
+        with pytest.raises(ValueError, match="Invalid pagination cursor"):
+            decode_cursor(cursor)
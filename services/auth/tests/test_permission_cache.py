@@ -0,0 +1,61 @@
+"""Tests for the Redis-backed permission cache."""
+
+import uuid
+
+import pytest
+from redis.exceptions import RedisError
+
+from app.services.permission_cache import permission_cache
+
+
+class TestPermissionCache:
+    """Tests for caching and invalidating permission codes."""
+
+    async def test_miss_then_hit(self, fake_redis):
+        """Stored codes are served until invalidated."""
+        user_id = uuid.uuid4()
+        assert await permission_cache.check(user_id, ["users:read"]) is None
+
+        generation = await permission_cache.generation(user_id)
+        await permission_cache.set_codes(user_id, ["users:read"], generation)
+
+        assert await permission_cache.check(user_id, ["users:read", "users:write"]) == [
+            True,
+            False,
+        ]
+
+    async def test_user_without_permissions_is_cached(self, fake_redis):
+        """An empty grant set is a hit, not a miss."""
+        user_id = uuid.uuid4()
+        await permission_cache.set_codes(user_id, [], await permission_cache.generation(user_id))
+
+        assert await permission_cache.check(user_id, ["users:read"]) == [False]
+
+    async def test_invalidate_drops_entry(self, fake_redis):
+        """Invalidation forces the next check to reload."""
+        user_id = uuid.uuid4()
+        await permission_cache.set_codes(user_id, ["users:read"], None)
+
+        await permission_cache.invalidate([user_id])
+
+        assert await permission_cache.check(user_id, ["users:read"]) is None
+
+    async def test_grants_read_before_invalidation_are_not_cached(self, fake_redis):
+        """A reload that raced an admin change does not re-cache revoked grants."""
+        user_id = uuid.uuid4()
+        generation = await permission_cache.generation(user_id)
+        # ... grants are loaded, then the admin commits and invalidates ...
+        await permission_cache.invalidate([user_id])
+        await permission_cache.set_codes(user_id, ["users:read"], generation)
+
+        assert await permission_cache.check(user_id, ["users:read"]) is None
+
+    async def test_invalidate_raises_when_redis_down(self, fake_redis, monkeypatch):
+        """A failed invalidation is reported to the caller."""
+
+        async def fail(*args, **kwargs):
+            raise RedisError("down")
+
+        monkeypatch.setattr(fake_redis, "incr", fail)
+        with pytest.raises(RedisError):
+            await permission_cache.invalidate([uuid.uuid4()])
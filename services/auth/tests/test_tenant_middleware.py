@@ -0,0 +1,70 @@
+"""Tests for the multi-tenancy middleware."""
+
+import uuid
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.api.deps import get_tenant_id
+from app.middleware.tenant import TenantMiddleware, _parse_uuid_header
+
+TENANT_ID = uuid.UUID("9b2f7e3c-1a6d-4c55-8f0e-2d3b4a5c6d7e")
+
+
+class TestParseUuidHeader:
+    """Tests for parsing the X-Tenant-ID header value."""
+
+    @pytest.mark.parametrize(
+        "value",
+        [str(TENANT_ID).encode(), str(TENANT_ID).upper().encode()],
+    )
+    def test_canonical_uuid(self, value):
+        """Hyphenated UUIDs parse, in either case."""
+        assert _parse_uuid_header(value) == TENANT_ID
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            b"",
+            b"junk",
+            TENANT_ID.hex.encode(),
+            b"{" + str(TENANT_ID).encode() + b"}",
+            b"9b2f7e3c1a6d-4c55-8f0e-2d3b-4a5c6d7e",
+            b"zb2f7e3c-1a6d-4c55-8f0e-2d3b4a5c6d7e",
+            "9b2f7e3c-1a6d-4c55-8f0e-2d3b4a5c6d7é".encode(),
+        ],
+    )
+    def test_invalid_values(self, value):
+        """Anything not shaped like a hyphenated UUID is ignored."""
+        assert _parse_uuid_header(value) is None
+
+
+class TestTenantMiddleware:
+    """Tests for storing the tenant on the request state."""
+
+    @pytest.fixture
+    def app(self):
+        app = FastAPI()
+        app.add_middleware(TenantMiddleware)
+
+        @app.get("/tenant")
+        async def tenant(tenant_id=Depends(get_tenant_id)):
+            return {"tenant_id": str(tenant_id) if tenant_id else None}
+
+        return app
+
+    @pytest.mark.parametrize(
+        ("headers", "expected"),
+        [
+            ({"X-Tenant-ID": str(TENANT_ID)}, str(TENANT_ID)),
+            ({"X-Tenant-ID": "junk"}, None),
+            ({}, None),
+        ],
+    )
+    async def test_tenant_on_request_state(self, app, headers, expected):
+        """The parsed header, or None, is available to dependencies."""
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/tenant", headers=headers)
+
+        assert response.json() == {"tenant_id": expected}
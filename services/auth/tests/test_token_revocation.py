@@ -0,0 +1,94 @@
+"""Tests for Redis-backed access token revocation."""
+
+import time
+import uuid
+
+import pytest
+from redis.exceptions import RedisError
+
+from app.core.security import create_access_token, decode_token
+from app.services import token_revocation
+from app.services.token_revocation import is_token_revoked, revoke_token, revoke_user_tokens
+
+
+class TestUserCutoff:
+    """Tests for revoking every token of a user."""
+
+    async def test_token_issued_before_revocation_is_revoked(self, fake_redis):
+        """A token issued before the cutoff is rejected."""
+        user_id = uuid.uuid4()
+        payload = decode_token(create_access_token({"sub": str(user_id)}))
+
+        await revoke_user_tokens(user_id)
+
+        assert await is_token_revoked(payload["jti"], user_id, payload["iat"])
+
+    async def test_same_second_issue_and_revoke(self, fake_redis, monkeypatch):
+        """Within one second, only tokens issued after the cutoff survive."""
+        user_id = uuid.uuid4()
+        monkeypatch.setattr(token_revocation.time, "time", lambda: 1_000.5)
+        await revoke_user_tokens(user_id)
+
+        assert await is_token_revoked(None, user_id, 1_000.2)
+        assert await is_token_revoked(None, user_id, 1_000.5)
+        assert not await is_token_revoked(None, user_id, 1_000.7)
+
+    async def test_whole_second_iat_in_cutoff_second_is_revoked(self, fake_redis, monkeypatch):
+        """Tokens with a whole-second iat cannot be ordered within the second."""
+        user_id = uuid.uuid4()
+        monkeypatch.setattr(token_revocation.time, "time", lambda: 1_000.5)
+        await revoke_user_tokens(user_id)
+
+        assert await is_token_revoked(None, user_id, 1_000)
+
+    async def test_token_issued_after_revocation_is_accepted(self, fake_redis):
+        """A token issued once the cutoff is written is not revoked."""
+        user_id = uuid.uuid4()
+        await revoke_user_tokens(user_id)
+        time.sleep(0.001)
+        payload = decode_token(create_access_token({"sub": str(user_id)}))
+
+        assert not await is_token_revoked(payload["jti"], user_id, payload["iat"])
+
+    async def test_other_users_unaffected(self, fake_redis):
+        """A cutoff only applies to its own user."""
+        await revoke_user_tokens(uuid.uuid4())
+
+        assert not await is_token_revoked(None, uuid.uuid4(), time.time() - 60)
+
+    async def test_revoke_raises_when_redis_down(self, fake_redis, monkeypatch):
+        """A failed cutoff write is reported to the caller."""
+
+        async def fail(*args, **kwargs):
+            raise RedisError("down")
+
+        monkeypatch.setattr(fake_redis, "set", fail)
+        with pytest.raises(RedisError):
+            await revoke_user_tokens(uuid.uuid4())
+
+
+class TestSingleToken:
+    """Tests for revoking one token by jti."""
+
+    async def test_revoked_jti_is_rejected(self, fake_redis):
+        """Only the revoked token is rejected."""
+        user_id = uuid.uuid4()
+        await revoke_token("abc", int(time.time()) + 60)
+
+        assert await is_token_revoked("abc", user_id, time.time())
+        assert not await is_token_revoked("def", user_id, time.time())
+
+    async def test_expired_token_is_not_stored(self, fake_redis):
+        """Revoking an already expired token writes nothing."""
+        await revoke_token("abc", int(time.time()) - 1)
+
+        assert fake_redis.data == {}
+
+    async def test_check_fails_open_when_redis_down(self, fake_redis, monkeypatch):
+        """An outage does not lock every user out."""
+
+        async def fail(*args, **kwargs):
+            raise RedisError("down")
+
+        monkeypatch.setattr(fake_redis, "mget", fail)
+        assert not await is_token_revoked("abc", uuid.uuid4(), time.time())
@@ -216,10 +216,9 @@ async def list_plans(
         page_size=page_size,
     )
 
-    # Build summaries with activity counts
+    # Build summaries; activity counts come precomputed with each plan
     summaries = []
-    for plan in items:
-        activities = plan.activities if hasattr(plan, "activities") else []
+    for plan, activities_total, activities_completed, activities_overdue in items:
         summaries.append(
             CropPlanSummary(
                 id=plan.id,
@@ -234,9 +233,9 @@ async def list_plans(
                 planned_planting_date=plan.planned_planting_date,
                 planned_acreage=plan.planned_acreage,
                 current_growth_stage=plan.current_growth_stage,
-                activities_total=len(activities),
-                activities_completed=sum(1 for a in activities if a.status == "completed"),
-                activities_overdue=sum(1 for a in activities if a.status == "overdue"),
+                activities_total=activities_total,
+                activities_completed=activities_completed,
+                activities_overdue=activities_overdue,
                 created_at=plan.created_at,
             )
         )
@@ -3,7 +3,7 @@
 import uuid
 from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import Row, and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -338,9 +338,27 @@ class CropPlanningService:
         year: int | None = None,
         page: int = 1,
         page_size: int = 20,
-    ) -> tuple[list[CropPlan], int]:
-        """List crop plans with filters."""
-        query = select(CropPlan).options(selectinload(CropPlan.activities))
+    ) -> tuple[list[Row[tuple[CropPlan, int, int, int]]], int]:
+        """List crop plans with filters.
+
+        Each row is ``(plan, activities_total, activities_completed,
+        activities_overdue)``; the counts are aggregated by the database, so
+        no activity rows are loaded.
+        """
+        query = (
+            select(
+                CropPlan,
+                func.count(PlannedActivity.id).label("activities_total"),
+                func.count(PlannedActivity.id)
+                .filter(PlannedActivity.status == ActivityStatus.COMPLETED.value)
+                .label("activities_completed"),
+                func.count(PlannedActivity.id)
+                .filter(PlannedActivity.status == ActivityStatus.OVERDUE.value)
+                .label("activities_overdue"),
+            )
+            .outerjoin(PlannedActivity, PlannedActivity.crop_plan_id == CropPlan.id)
+            .group_by(CropPlan.id)
+        )
 
         conditions = []
         if farmer_id:
@@ -370,7 +388,7 @@ class CropPlanningService:
         query = query.order_by(CropPlan.created_at.desc())
 
         result = await self.db.execute(query)
-        items = list(result.scalars().all())
+        items = list(result.all())
 
         return items, total
 
@@ -1137,7 +1155,8 @@ class CropPlanningService:
         now = datetime.now(UTC)
 
         # Count plans by status
-        plans, _ = await self.list_plans(farmer_id=farmer_id, page_size=100)
+        rows, _ = await self.list_plans(farmer_id=farmer_id, page_size=100)
+        plans = [row.CropPlan for row in rows]
 
         active_count = sum(1 for p in plans if p.status == CropPlanStatus.ACTIVE.value)
         draft_count = sum(1 for p in plans if p.status == CropPlanStatus.DRAFT.value)
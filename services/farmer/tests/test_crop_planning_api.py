@@ -316,6 +316,43 @@ class TestCropPlanAPI:
         data = response.json()
         assert data["total"] >= 1
 
+    @pytest.mark.asyncio
+    async def test_list_plans_activity_counts(
+        self, client: AsyncClient, db_session, cp_farmer, cp_plan
+    ):
+        """Test that listed plans carry their activity counts."""
+        for i, activity_status in enumerate(
+            [
+                ActivityStatus.COMPLETED,
+                ActivityStatus.COMPLETED,
+                ActivityStatus.OVERDUE,
+                ActivityStatus.SCHEDULED,
+            ]
+        ):
+            db_session.add(
+                PlannedActivity(
+                    id=uuid.uuid4(),
+                    crop_plan_id=cp_plan.id,
+                    activity_type="weeding",
+                    title=f"Weeding round {i + 1}",
+                    scheduled_date=datetime(2026, 4, 1 + i, tzinfo=timezone.utc),
+                    status=activity_status.value,
+                )
+            )
+        await db_session.commit()
+
+        response = await client.get(
+            "/api/v1/crop-planning/plans",
+            params={"farmer_id": str(cp_farmer.id)},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        summary = data["items"][0]
+        assert summary["activities_total"] == 4
+        assert summary["activities_completed"] == 2
+        assert summary["activities_overdue"] == 1
+
     @pytest.mark.asyncio
     async def test_get_plan(self, client: AsyncClient, cp_plan):
         """Test getting a crop plan by ID."""